@@ -0,0 +1,31 @@
+import datetime
+from typing import List
+
+from marshmallow import Schema, fields
+
+
+class Listing:
+
+    def __init__(self, id, name, price, active, created):
+        self.id = id
+        self.name = name
+        self.price = price
+        self.active = active
+        self.created = created
+
+
+class ListingSchema(Schema):
+
+    id = fields.Int()
+    name = fields.Str()
+    price = fields.Float()
+    active = fields.Bool()
+    created = fields.DateTime()
+
+
+def make_listings(rows: int) -> List[Listing]:
+    created = datetime.datetime(2020, 1, 1)
+    return [
+        Listing(i, f'listing {i}', i * 1.5, bool(i % 2), created)
+        for i in range(rows)
+    ]
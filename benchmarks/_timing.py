@@ -0,0 +1,19 @@
+import timeit
+from typing import Any, Callable
+
+
+def best_of(
+        func: Callable[[], Any], *,
+        number: int = 100,
+        repeat: int = 5
+) -> float:
+    """Return the best time, in seconds, of a single call to `func`."""
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f} {unit}'
+    return f'{seconds / 1e-9:.2f} ns'
@@ -0,0 +1,92 @@
+"""
+Compare the resolution of ViewSet routes by aiohttp's `UrlDispatcher`
+with `RadixUrlDispatcher`, for apps with 10, 100 and 1000 ViewSets.
+
+    python -m benchmarks.bench_dispatch
+"""
+import asyncio
+from typing import Dict, List, Type
+
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+
+from laviewset import HttpMethods, Route, ViewSet
+from laviewset.dispatch import RadixUrlDispatcher
+
+from ._timing import best_of, format_seconds
+
+ROUTES = (10, 100, 1000)
+ROUTERS: Dict[str, Type[web.UrlDispatcher]] = {
+    'UrlDispatcher': web.UrlDispatcher,
+    'RadixUrlDispatcher': RadixUrlDispatcher,
+}
+
+
+def make_router(
+        router_class: Type[web.UrlDispatcher],
+        routes: int
+) -> web.UrlDispatcher:
+    """Register `routes` ViewSets, each with a list and a detail view."""
+    router = router_class()
+    base_route = Route.create_base(router)
+    for i in range(routes):
+        viewset_route = base_route.extend(f'resource{i}')
+
+        class _ViewSet(ViewSet):
+
+            route = viewset_route
+
+            @viewset_route('/', HttpMethods.GET)
+            async def list(self, request):
+                ...
+
+            @viewset_route(r'/{pk:\d+}', HttpMethods.GET)
+            async def retrieve(self, request, *, pk):
+                ...
+    router.freeze()
+    return router
+
+
+def make_requests(routes: int) -> List[web.Request]:
+    """Requests for the first, middle and last ViewSets' views."""
+    return [
+        make_mocked_request('GET', path)
+        for i in (0, routes // 2, routes - 1)
+        for path in (f'/resource{i}', f'/resource{i}/42')
+    ]
+
+
+async def _resolve_all(router, requests):
+    for request in requests:
+        await router.resolve(request)
+
+
+def run() -> Dict[str, float]:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    results = {}
+    try:
+        for routes in ROUTES:
+            requests = make_requests(routes) * 100
+            for name, router_class in ROUTERS.items():
+                router = make_router(router_class, routes)
+                seconds = best_of(
+                    lambda: loop.run_until_complete(
+                        _resolve_all(router, requests)
+                    ),
+                    number=10
+                )
+                results[f'{name}[{routes}]'] = seconds / len(requests)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+    return results
+
+
+def main() -> None:
+    for name, seconds in run().items():
+        print(f'{name:<32} {format_seconds(seconds)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Measure requests dispatched end to end, through aiohttp's test client
+and server, to the views of a ViewSet and to a ModelViewSet backed by a
+`MemoryBackend`, i.e. without a database.
+
+    python -m benchmarks.bench_e2e
+"""
+import asyncio
+from typing import Dict
+
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from laviewset import (
+    HttpMethods,
+    MemoryBackend,
+    ModelViewSet,
+    Route,
+    ViewSet,
+    install
+)
+
+from ._models import ListingSchema, make_listings
+from ._timing import best_of, format_seconds
+
+# Requests per timed batch.
+REQUESTS = 100
+PATHS = {
+    'list': '/listings',
+    'retrieve': '/listings/42',
+    'typed': '/listings/42/typed',
+    'not_found': '/listings/x/typed',
+    'model.list': '/models?limit=100',
+    'model.retrieve': '/models/42',
+}
+
+
+def make_backend() -> MemoryBackend:
+    return MemoryBackend(objects=(
+        vars(listing) for listing in make_listings(1000)
+    ))
+
+
+def make_app() -> web.Application:
+    listings_route = Route.create_base().extend('listings')
+
+    class ListingsViewSet(ViewSet):
+
+        route = listings_route
+
+        @route('/', HttpMethods.GET)
+        async def list(self, request):
+            return self.json_response([])
+
+        @route('/{pk}', HttpMethods.GET)
+        async def retrieve(self, request, *, pk):
+            return self.json_response({'id': pk})
+
+        @route('/{pk:int}/typed', HttpMethods.GET)
+        async def typed(self, request, *, pk):
+            return self.json_response({'id': pk})
+
+    models_route = Route.create_base().extend('models')
+
+    class ListingsModelViewSet(ModelViewSet):
+
+        route = models_route
+        serializer_class = ListingSchema
+        backend = make_backend()
+
+    app = web.Application()
+    install(app, [ListingsViewSet, ListingsModelViewSet])
+    return app
+
+
+async def _start_client() -> TestClient:
+    client = TestClient(TestServer(make_app()))
+    await client.start_server()
+    return client
+
+
+async def _get_all(client: TestClient, path: str) -> None:
+    for _ in range(REQUESTS):
+        resp = await client.get(path)
+        await resp.read()
+
+
+def run() -> Dict[str, float]:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    results = {}
+    try:
+        client = loop.run_until_complete(_start_client())
+        for name, path in PATHS.items():
+            seconds = best_of(
+                lambda: loop.run_until_complete(_get_all(client, path)),
+                number=5
+            )
+            results[f'request.{name}'] = seconds / REQUESTS
+        loop.run_until_complete(client.close())
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+    return results
+
+
+def main() -> None:
+    for name, seconds in run().items():
+        print(f'{name:<32} {format_seconds(seconds)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Compare the stdlib JSON encoder used by ``web.json_response`` with a
+plugged `JsonCodec` on ``ListMixin`` sized payloads.
+
+    python -m benchmarks.bench_json
+"""
+from typing import Dict
+
+from aiohttp import web
+
+from laviewset import JsonCodec
+
+from ._models import ListingSchema, make_listings
+from ._timing import best_of, format_seconds
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+ROWS = (1, 100, 10_000)
+
+
+def make_payload(rows: int):
+    return ListingSchema(many=True).dump(make_listings(rows))
+
+
+def run() -> Dict[str, float]:
+    codecs = {'stdlib': JsonCodec()}
+    if orjson is not None:
+        codecs['orjson'] = JsonCodec(orjson.dumps, orjson.loads)
+
+    results = {}
+    for rows in ROWS:
+        payload = make_payload(rows)
+        number = max(1, 10_000 // rows)
+        results[f'web.json_response[{rows}]'] = best_of(
+            lambda: web.json_response(payload), number=number
+        )
+        for name, codec in codecs.items():
+            results[f'{name}.response[{rows}]'] = best_of(
+                lambda: codec.response(payload), number=number
+            )
+    return results
+
+
+def main() -> None:
+    for name, seconds in run().items():
+        print(f'{name:<32} {format_seconds(seconds)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Measure the serialization done by ``ListMixin.list`` once the rows are
+fetched: dumping with the ViewSet's dumper, encoding, the ETag and the
+response, at 1, 100 and 10k rows.
+
+    python -m benchmarks.bench_list
+"""
+from typing import Any, Dict
+
+from laviewset import Route, ViewSet
+from laviewset.codec import json_body_response
+from laviewset.conditional import make_etag
+
+from ._models import ListingSchema, make_listings
+from ._timing import best_of, format_seconds
+
+ROWS = (1, 100, 10_000)
+
+
+def make_viewset(compile_serializers: bool) -> Any:
+    # A deferred route, the ViewSet is never installed.
+    listings_route = Route.create_base().extend('listings')
+
+    class ListingsViewSet(ViewSet):
+
+        route = listings_route
+        serializer_class = ListingSchema
+
+    ListingsViewSet.compile_serializers = compile_serializers
+    return ListingsViewSet()
+
+
+def render(viewset: Any, rows: Any) -> Any:
+    body = viewset.get_codec().encode(viewset.get_dumper(many=True)(rows))
+    return json_body_response(body, headers={'ETag': make_etag(body)})
+
+
+def run() -> Dict[str, float]:
+    results = {}
+    viewsets = {
+        'dump': make_viewset(compile_serializers=False),
+        'compiled': make_viewset(compile_serializers=True),
+    }
+    for rows in ROWS:
+        objs = make_listings(rows)
+        number = max(1, 10_000 // rows)
+        for name, viewset in viewsets.items():
+            results[f'list.{name}[{rows}]'] = best_of(
+                lambda: render(viewset, objs), number=number
+            )
+    return results
+
+
+def main() -> None:
+    for name, seconds in run().items():
+        print(f'{name:<32} {format_seconds(seconds)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Measure the path building of `Resource`, which runs once per route when
+ViewSets are defined, for deep paths and many resources.
+
+    python -m benchmarks.bench_resources
+"""
+from typing import Dict
+
+from laviewset.resources import (
+    Resource,
+    Rfc,
+    non_strict_build,
+    strict_build
+)
+
+from ._timing import best_of, format_seconds
+
+# Segments per path.
+DEPTHS = (1, 10, 100)
+# Resources extended from a single base.
+RESOURCES = (10, 100, 1000)
+
+
+def make_path(depth: int) -> str:
+    return ''.join(f'/segment{i}/' for i in range(depth))
+
+
+def build_resources(resources: int, enforce: Rfc) -> None:
+    """Extend `resources` resources from a base, each with a collection
+    and a subordinate leaf, as ViewSets do.
+    """
+    base = Resource.create_base(enforce=enforce)
+    for i in range(resources):
+        resource = base.extend(f'resource{i}')
+        if enforce is Rfc.STRICT:
+            resource.leaf('/', res_type=Rfc.COL)
+            resource.leaf('/{pk}', res_type=Rfc.SUB)
+        else:
+            resource.leaf('/')
+            resource.leaf('/{pk}')
+
+
+def run() -> Dict[str, float]:
+    results = {}
+    for depth in DEPTHS:
+        path = make_path(depth)
+        number = max(10, 10_000 // depth)
+        results[f'strict_build[{depth}]'] = best_of(
+            lambda: strict_build(path), number=number
+        )
+        results[f'non_strict_build[{depth}]'] = best_of(
+            lambda: non_strict_build(path), number=number
+        )
+        resource = Resource(path)
+        results[f'Resource.build[{depth}]'] = best_of(
+            lambda: Resource(path).build(), number=number
+        )
+        results[f'Resource.extend[{depth}]'] = best_of(
+            lambda: resource.extend('/child'), number=number
+        )
+        results[f'Resource.leaf[{depth}]'] = best_of(
+            lambda: resource.leaf('/{pk}'), number=number
+        )
+
+    for resources in RESOURCES:
+        number = max(1, 1000 // resources)
+        for enforce in (Rfc.NON_STRICT, Rfc.STRICT):
+            results[f'build_resources.{enforce.value}[{resources}]'] = \
+                best_of(
+                    lambda: build_resources(resources, enforce),
+                    number=number
+                )
+    return results
+
+
+def main() -> None:
+    for name, seconds in run().items():
+        print(f'{name:<40} {format_seconds(seconds)}')
+
+
+if __name__ == '__main__':
+    main()
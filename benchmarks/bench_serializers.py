@@ -0,0 +1,52 @@
+"""
+Compare ``Schema.dump`` with the function returned by `compile_dump` on
+``ListMixin`` sized lists.
+
+    python -m benchmarks.bench_serializers
+"""
+from typing import Dict
+
+from marshmallow import Schema, fields
+
+from laviewset.serializers import compile_dump
+
+from ._models import ListingSchema, make_listings
+from ._timing import best_of, format_seconds
+
+ROWS = (1, 100, 10_000)
+
+
+class SimpleListingSchema(Schema):
+    """A schema whose fields can all be compiled."""
+
+    id = fields.Int()
+    name = fields.Str()
+    price = fields.Float()
+    active = fields.Bool()
+
+
+def run() -> Dict[str, float]:
+    results = {}
+    for schema_class in (SimpleListingSchema, ListingSchema):
+        schema = schema_class(many=True)
+        compiled = compile_dump(schema)
+        for rows in ROWS:
+            objs = make_listings(rows)
+            number = max(1, 10_000 // rows)
+            name = schema_class.__name__
+            results[f'{name}.dump[{rows}]'] = best_of(
+                lambda: schema.dump(objs), number=number
+            )
+            results[f'{name}.compiled[{rows}]'] = best_of(
+                lambda: compiled(objs), number=number
+            )
+    return results
+
+
+def main() -> None:
+    for name, seconds in run().items():
+        print(f'{name:<36} {format_seconds(seconds)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Measure the per-request overhead of the handlers wrapping views, and
+the definition of ViewSets with many views.
+
+    python -m benchmarks.bench_views
+"""
+import types
+from typing import Any, Callable, Dict
+
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+
+from laviewset import HttpMethods, Route, ViewSet
+from laviewset.views import _ViewSetMeta, _get_handler_from_view
+
+from ._timing import best_of, format_seconds
+
+# Views per ViewSet.
+VIEWS = (10, 100, 1000)
+
+_RESPONSE = web.Response()
+
+
+def _run(coro) -> Any:
+    """Run a coroutine that never suspends, without an event loop."""
+    try:
+        coro.send(None)
+    except StopIteration as e:
+        return e.value
+    raise RuntimeError('The coroutine suspended.')
+
+
+def make_handler_viewset(router: web.UrlDispatcher) -> Any:
+    handlers_route = Route.create_base(router).extend('handlers')
+
+    class HandlerViewSet(ViewSet):
+
+        route = handlers_route
+
+        @route('/', HttpMethods.GET)
+        async def no_args(self, request):
+            return _RESPONSE
+
+        @route('/{pk}', HttpMethods.GET)
+        async def one_arg(self, request, *, pk):
+            return _RESPONSE
+
+        @route('/{pk:int}/typed', HttpMethods.GET)
+        async def typed_arg(self, request, *, pk):
+            return _RESPONSE
+
+        @route('/{a}/{b}/{c}', HttpMethods.GET)
+        async def three_args(self, request, *, a, b, c):
+            return _RESPONSE
+
+    return HandlerViewSet()
+
+
+def _make_view(i: int) -> Callable:
+    if i % 2:
+        async def view(self, request, *, pk):
+            return _RESPONSE
+    else:
+        async def view(self, request):
+            return _RESPONSE
+    return view
+
+
+def define_viewset(views: int) -> type:
+    """Define a ViewSet with `views` views, half of them with a path
+    variable.
+    """
+    route = Route.create_base(web.UrlDispatcher()).extend('many')
+    ns = {'route': route}
+    for i in range(views):
+        path = f'/view{i}/{{pk:int}}' if i % 2 else f'/view{i}'
+        ns[f'view{i}'] = route(path, HttpMethods.GET)(_make_view(i))
+    cls = types.new_class(
+        'ManyViewSet', (ViewSet,), exec_body=lambda body: body.update(ns)
+    )
+    # ViewSets are singletons; don't keep every instance alive.
+    _ViewSetMeta._instances.pop(cls, None)
+    return cls
+
+
+def run() -> Dict[str, float]:
+    results = {}
+    viewset = make_handler_viewset(web.UrlDispatcher())
+    cases = {
+        'no_args': ({}, {}),
+        'one_arg': ({'pk': '42'}, {'pk': '42'}),
+        'typed_arg': ({'pk': '42'}, {'pk': 42}),
+        'three_args': (
+            {'a': '1', 'b': '2', 'c': '3'},
+            {'a': '1', 'b': '2', 'c': '3'}
+        ),
+    }
+    for name, (match_info, kwargs) in cases.items():
+        view = getattr(viewset, name)
+        handler = _get_handler_from_view(view)
+        request = make_mocked_request('GET', '/', match_info=match_info)
+        results[f'view.{name}'] = best_of(
+            lambda: _run(view(request, **kwargs)), number=10_000
+        )
+        results[f'handler.{name}'] = best_of(
+            lambda: _run(handler(request)), number=10_000
+        )
+
+    for views in VIEWS:
+        results[f'define_viewset[{views}]'] = best_of(
+            lambda: define_viewset(views),
+            number=max(1, 100 // views), repeat=3
+        )
+    return results
+
+
+def main() -> None:
+    for name, seconds in run().items():
+        print(f'{name:<32} {format_seconds(seconds)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare two results files written by `benchmarks.run`, and flag the
+cases that got slower by more than a threshold.
+
+    python -m benchmarks.compare base.json head.json --threshold 0.1
+
+Exits with status 1 if any case regressed.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from ._timing import format_seconds
+
+
+class Change(NamedTuple):
+
+    case: str
+    base: float
+    head: float
+
+    @property
+    def ratio(self) -> float:
+        return self.head / self.base
+
+
+def load(path: str) -> Dict[str, float]:
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare(
+        base: Dict[str, float],
+        head: Dict[str, float]
+) -> List[Change]:
+    """Pair the cases measured in both `base` and `head`."""
+    return [
+        Change(case, base[case], head[case])
+        for case in sorted(base.keys() & head.keys())
+    ]
+
+
+def regressions(
+        changes: Iterable[Change], threshold: float
+) -> List[Change]:
+    return [change for change in changes if change.ratio > 1 + threshold]
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.compare',
+        description=__doc__.split('\n\n')[1]
+    )
+    parser.add_argument('base', help='results of the baseline')
+    parser.add_argument('head', help='results to compare to the baseline')
+    parser.add_argument(
+        '--threshold', type=float, default=0.1,
+        help='relative slowdown reported as a regression (default: 0.1)'
+    )
+    args = parser.parse_args(argv)
+
+    base, head = load(args.base), load(args.head)
+    changes = compare(base, head)
+    regressed = regressions(changes, args.threshold)
+    for change in changes:
+        flag = '  REGRESSION' if change in regressed else ''
+        print(
+            f'{change.case:<48} {format_seconds(change.base):>10} -> '
+            f'{format_seconds(change.head):>10} '
+            f'({change.ratio - 1:+.1%}){flag}'
+        )
+    for case in sorted(base.keys() ^ head.keys()):
+        side = 'base' if case in base else 'head'
+        print(f'{case:<48} only in {side}')
+
+    if regressed:
+        print(f'{len(regressed)} regression(s) above '
+              f'{args.threshold:.0%}.', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Run the benchmarks and store their results as JSON, so that the results
+of two commits can be compared with `benchmarks.compare`.
+
+    python -m benchmarks.run -o base.json
+    python -m benchmarks.run -o head.json views e2e
+
+Results are the best time, in seconds, of a single operation, keyed by
+``<benchmark>:<case>``.
+"""
+import argparse
+import datetime
+import importlib
+import json
+import platform
+import subprocess
+import sys
+from typing import Any, Dict, Iterable, Optional
+
+import aiohttp
+
+from ._timing import format_seconds
+
+BENCHMARKS = (
+    'dispatch',
+    'e2e',
+    'json',
+    'list',
+    'resources',
+    'serializers',
+    'views',
+)
+FORMAT_VERSION = 1
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            universal_newlines=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(benchmarks: Iterable[str] = BENCHMARKS) -> Dict[str, Any]:
+    results: Dict[str, float] = {}
+    for name in benchmarks:
+        module = importlib.import_module(f'.bench_{name}', __package__)
+        for case, seconds in module.run().items():
+            results[f'{name}:{case}'] = seconds
+    return {
+        'version': FORMAT_VERSION,
+        'commit': _git_commit(),
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'aiohttp': aiohttp.__version__,
+        'results': results,
+    }
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.run', description=__doc__.split('\n\n')[0]
+    )
+    parser.add_argument(
+        'benchmarks', nargs='*', metavar='BENCHMARK',
+        help=f'benchmarks to run, among {", ".join(BENCHMARKS)}; all by '
+             'default'
+    )
+    parser.add_argument(
+        '-o', '--output', metavar='FILE',
+        help='write the results to FILE as JSON'
+    )
+    args = parser.parse_args(argv)
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f'unknown benchmarks: {", ".join(sorted(unknown))}')
+
+    report = run(args.benchmarks or BENCHMARKS)
+    for case, seconds in report['results'].items():
+        print(f'{case:<48} {format_seconds(seconds)}', file=sys.stderr)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+
+if __name__ == '__main__':
+    main()
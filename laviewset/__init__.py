@@ -1,14 +1,14 @@
-from typing import Tuple
+import importlib
+from typing import Any, List, Tuple
 
 from .routes import Route
-from .views import (
-    ViewSet,
-    ModelViewSet,
-    ReadOnlyModelViewSet
-)
+from .views import ViewSet
 from .http_meths import HttpMethods
-from .mixins import SerializerMixin
 from .resources import rfc
+from .codec import JsonCodec, set_json_codec
+from .cache import LRUCache
+from .registry import install
+from .backends import MemoryBackend
 
 __all__: Tuple[str] = (
     'Route',
@@ -17,9 +17,45 @@ __all__: Tuple[str] = (
     'ModelViewSet',
     'ReadOnlyModelViewSet',
     'SerializerMixin',
-    'rfc'
+    'rfc',
+    'JsonCodec',
+    'set_json_codec',
+    'LRUCache',
+    'PrimaryKeyLoader',
+    'install',
+    'MemoryBackend',
+    'GinoBackend'
 )
 
+# Names whose modules import marshmallow, sqlalchemy or gino, loaded
+# on first access so that plain ViewSets start without them.
+_lazy = {
+    'ModelViewSet': 'model_views',
+    'ReadOnlyModelViewSet': 'model_views',
+    'SerializerMixin': 'mixins',
+    'PrimaryKeyLoader': 'loaders',
+    'GinoBackend': 'gino_backend',
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _lazy[name]
+    except KeyError:
+        raise AttributeError(
+            f'module {__name__!r} has no attribute {name!r}'
+        ) from None
+    module = importlib.import_module(f'.{module_name}', __name__)
+    value = getattr(module, name)
+    # Cached, so later accesses don't go through __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
 __version__ = "0.1.1"
 
 __author__ = "Milad M. Nasrollahi"
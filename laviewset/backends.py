@@ -0,0 +1,381 @@
+"""
+Storage backends of model ViewSets.
+
+The CRUD mixins read and write objects through a `Backend`. ViewSets with
+a `model` use a `GinoBackend` by default; any other backend can be set
+as the ViewSet's `backend`, such as the `MemoryBackend`, which keeps
+objects in a dict and needs no database:
+
+    class ListingsModelViewSet(ModelViewSet):
+
+        route = listings_route
+        serializer_class = ListingsSchema
+        backend = MemoryBackend()
+"""
+import bisect
+import types
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple
+)
+
+from ._compat import Protocol
+
+__all__ = (
+    'Backend',
+    'MemoryBackend',
+    'ObjectsNotFound',
+    'UniqueViolation',
+    'load_pk',
+)
+
+# Attribute names of the objects a backend should at least load.
+Only = Optional[Tuple[str, ...]]
+
+
+class ObjectsNotFound(LookupError):
+    """Exception class for bulk writes missing some of their objects.
+
+    Nothing is written when it is raised.
+    """
+
+    def __init__(self, pks: Sequence[Hashable]):
+        super().__init__(pks)
+        self.pks = pks
+
+
+class UniqueViolation(Exception):
+    """Exception class for writes violating a unique constraint."""
+
+    def __init__(
+            self, constraint_name: Optional[str] = None,
+            detail: Optional[str] = None
+    ):
+        super().__init__(constraint_name, detail)
+        self.constraint_name = constraint_name
+        self.detail = detail
+
+
+def load_pk(value: Any, pk_type: Callable[[Any], Hashable]) -> Hashable:
+    """Convert a primary key read from JSON with `pk_type`.
+
+    Raise a ValueError unless the JSON type of `value` matches the
+    converted key, e.g. for `true`, `1.5` or `"1"` given for an integer
+    key.
+    """
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError(f'Invalid primary key {value!r}.')
+    pk = pk_type(value)
+    if isinstance(value, str):
+        matches = isinstance(pk, bool) or not isinstance(pk, (int, float))
+    else:
+        matches = pk == value and not (
+            isinstance(value, float) and isinstance(pk, int)
+        )
+    if not matches:
+        raise ValueError(f'Invalid primary key {value!r}.')
+    return pk
+
+
+class Backend(Protocol):
+    """The storage operations used by the CRUD mixins.
+
+    Objects are identified by their `id` attribute. `only` names the
+    attributes a caller needs, which backends may use to load less; the
+    objects returned may always hold more. Reads asked for `records` may
+    return read-only rows instead of objects, whose values are read as
+    attributes too, when `only` is given. `filters` are the
+    `laviewset.filters.BoundFilters` of a request, or None.
+    """
+
+    # Name of the objects, used in error messages.
+    name: str
+    # Type of the primary keys.
+    pk_type: Callable[[Any], Hashable]
+    # Whether `filters` with WHERE or ORDER BY clauses are supported.
+    filterable: bool
+
+    async def get(
+            self, pk: Hashable, *,
+            only: Only = None,
+            records: bool = False
+    ) -> Optional[Any]:
+        ...
+
+    async def list(
+            self, page: Any, *,
+            filters: Any = None,
+            only: Only = None,
+            records: bool = False
+    ) -> List[Any]:
+        """Get the objects of a `laviewset.pagination.PageParams`, in
+        primary key order unless `filters` order them, plus one object
+        to know whether a next page exists.
+        """
+
+    def iterate(
+            self, *,
+            chunk_size: int,
+            filters: Any = None,
+            only: Only = None,
+            records: bool = False
+    ) -> AsyncIterator[List[Any]]:
+        """Iterate over every object, `chunk_size` at a time."""
+
+    async def count(self, filters: Any = None, *, mode: str) -> int:
+        """Count the objects, either exactly or estimated."""
+
+    async def create(self, values: Mapping[str, Any]) -> Any:
+        ...
+
+    async def update(
+            self, pk: Hashable, values: Mapping[str, Any]
+    ) -> Optional[Any]:
+        """Update the object with `pk`, or return None if it doesn't
+        exist.
+        """
+
+    async def update_object(
+            self, obj: Any, values: Mapping[str, Any]
+    ) -> Any:
+        ...
+
+    async def delete(self, pk: Hashable) -> bool:
+        """Delete the object with `pk` and return whether it existed."""
+
+    async def delete_object(self, obj: Any) -> None:
+        ...
+
+    async def bulk_create(
+            self, items: Sequence[Mapping[str, Any]]
+    ) -> List[Any]:
+        ...
+
+    async def bulk_update(
+            self, pks: Sequence[Hashable],
+            items: Sequence[Mapping[str, Any]]
+    ) -> Dict[Hashable, Any]:
+        """Set `items[i]` on the object with `pks[i]` and return the
+        updated objects by primary key.
+        """
+
+    async def bulk_delete(self, pks: Sequence[Hashable]) -> None:
+        ...
+
+    async def delete_filtered(
+            self, filters: Any, *, limit: int
+    ) -> Optional[List[Hashable]]:
+        """Delete the objects matching the WHERE clause of `filters`
+        and return their primary keys, or None without deleting
+        anything if more than `limit` objects match.
+        """
+
+
+def _duplicate(pk: Hashable) -> UniqueViolation:
+    return UniqueViolation(detail=f'Key (id)=({pk}) already exists.')
+
+
+def _unfiltered(filters: Any) -> None:
+    if filters is not None and (
+            filters.whereclause is not None or filters.ordered
+    ):
+        raise NotImplementedError('Filters are not supported.')
+
+
+class MemoryBackend:
+    """A `Backend` keeping objects in a dict, indexed by primary key.
+
+    Objects are built with `factory`, called with their values as
+    keyword arguments, e.g. a model class. Objects created without an
+    `id` are given the next integer one, and objects whose `id` is
+    updated are indexed under the new one. Filtering and ordering aren't
+    supported, and estimated counts are exact.
+    """
+
+    filterable = False
+
+    def __init__(
+            self, factory: Callable[..., Any] = types.SimpleNamespace, *,
+            objects: Iterable[Mapping[str, Any]] = (),
+            name: Optional[str] = None,
+            pk_type: Callable[[Any], Hashable] = int
+    ):
+        self.factory = factory
+        self.name = name if name is not None else factory.__qualname__
+        self.pk_type = pk_type
+        self._objects: Dict[Hashable, Any] = {}
+        # Primary keys in order, for pagination.
+        self._pks: List[Any] = []
+        for values in objects:
+            self._insert(self._build(values))
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def _build(self, values: Mapping[str, Any]) -> Any:
+        if values.get('id') is None:
+            values = {
+                **values, 'id': self._pks[-1] + 1 if self._pks else 1
+            }
+        if values['id'] in self._objects:
+            raise _duplicate(values['id'])
+        return self.factory(**values)
+
+    def _insert(self, obj: Any) -> None:
+        self._objects[obj.id] = obj
+        bisect.insort(self._pks, obj.id)
+
+    def _remove(self, pk: Hashable) -> None:
+        del self._objects[pk]
+        del self._pks[bisect.bisect_left(self._pks, pk)]
+
+    def _missing(self, pks: Iterable[Hashable]) -> List[Hashable]:
+        return [pk for pk in pks if pk not in self._objects]
+
+    def _write(
+            self, objs: Sequence[Any],
+            items: Sequence[Mapping[str, Any]]
+    ) -> None:
+        """Set `items[i]` on `objs[i]`, indexing the stored objects whose
+        primary key changes under the new one. Nothing is written if a
+        new primary key is already taken.
+        """
+        moved = [
+            (obj, values['id']) for obj, values in zip(objs, items)
+            if 'id' in values and values['id'] != obj.id
+            and self._objects.get(obj.id) is obj
+        ]
+        if moved:
+            kept = set(self._objects).difference(obj.id for obj, _ in moved)
+            for _, pk in moved:
+                if pk in kept:
+                    raise _duplicate(pk)
+                kept.add(pk)
+            for obj, _ in moved:
+                self._remove(obj.id)
+        for obj, values in zip(objs, items):
+            for name, value in values.items():
+                setattr(obj, name, value)
+        for obj, _ in moved:
+            self._insert(obj)
+
+    async def get(
+            self, pk: Hashable, *,
+            only: Only = None,
+            records: bool = False
+    ) -> Optional[Any]:
+        return self._objects.get(pk)
+
+    async def list(
+            self, page: Any, *,
+            filters: Any = None,
+            only: Only = None,
+            records: bool = False
+    ) -> List[Any]:
+        _unfiltered(filters)
+        pks = self._pks
+        if page.limit is None:
+            return [self._objects[pk] for pk in pks]
+        if page.after is not None:
+            start = bisect.bisect_right(pks, page.after)
+        else:
+            start = page.offset or 0
+        return [
+            self._objects[pk] for pk in pks[start:start + page.limit + 1]
+        ]
+
+    async def iterate(
+            self, *,
+            chunk_size: int,
+            filters: Any = None,
+            only: Only = None,
+            records: bool = False
+    ) -> AsyncIterator[List[Any]]:
+        _unfiltered(filters)
+        pks = list(self._pks)
+        for i in range(0, len(pks), chunk_size):
+            chunk = [
+                self._objects[pk] for pk in pks[i:i + chunk_size]
+                if pk in self._objects
+            ]
+            if chunk:
+                yield chunk
+
+    async def count(self, filters: Any = None, *, mode: str) -> int:
+        _unfiltered(filters)
+        return len(self._objects)
+
+    async def create(self, values: Mapping[str, Any]) -> Any:
+        obj = self._build(values)
+        self._insert(obj)
+        return obj
+
+    async def update(
+            self, pk: Hashable, values: Mapping[str, Any]
+    ) -> Optional[Any]:
+        obj = self._objects.get(pk)
+        if obj is not None:
+            await self.update_object(obj, values)
+        return obj
+
+    async def update_object(
+            self, obj: Any, values: Mapping[str, Any]
+    ) -> Any:
+        self._write([obj], [values])
+        return obj
+
+    async def delete(self, pk: Hashable) -> bool:
+        if pk not in self._objects:
+            return False
+        self._remove(pk)
+        return True
+
+    async def delete_object(self, obj: Any) -> None:
+        await self.delete(obj.id)
+
+    async def bulk_create(
+            self, items: Sequence[Mapping[str, Any]]
+    ) -> List[Any]:
+        created: List[Any] = []
+        try:
+            for values in items:
+                obj = self._build(values)
+                self._insert(obj)
+                created.append(obj)
+        except UniqueViolation:
+            for obj in created:
+                self._remove(obj.id)
+            raise
+        return created
+
+    async def bulk_update(
+            self, pks: Sequence[Hashable],
+            items: Sequence[Mapping[str, Any]]
+    ) -> Dict[Hashable, Any]:
+        missing = self._missing(pks)
+        if missing:
+            raise ObjectsNotFound(missing)
+        objs = [self._objects[pk] for pk in pks]
+        self._write(objs, items)
+        return dict(zip(pks, objs))
+
+    async def bulk_delete(self, pks: Sequence[Hashable]) -> None:
+        missing = self._missing(pks)
+        if missing:
+            raise ObjectsNotFound(missing)
+        for pk in pks:
+            self._remove(pk)
+
+    async def delete_filtered(
+            self, filters: Any, *, limit: int
+    ) -> Optional[List[Hashable]]:
+        raise NotImplementedError('Filters are not supported.')
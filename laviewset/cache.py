@@ -0,0 +1,156 @@
+"""
+An in-process LRU cache for encoded response bodies.
+
+    class ListingsModelViewSet(ModelViewSet):
+
+        route = listings_route
+        model = ListingsModel
+        serializer_class = ListingsSchema
+        cache = LRUCache(maxsize=10_000, ttl=60, max_bytes=64 * 2**20)
+
+A value computed from a read that may race with writes is stored with
+the `stamp` taken before the read, so that it is dropped if the key was
+written in the meantime:
+
+    since = cache.stamp()
+    body = await render(pk)
+    cache.set(pk, body, since=since)
+"""
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, NamedTuple, Optional, Tuple
+
+__all__ = (
+    'CacheInfo',
+    'LRUCache',
+)
+
+# Number of keys whose last write is remembered for `LRUCache.set`'s
+# `since`.
+_WRITE_LOG_SIZE = 1024
+
+
+class CacheInfo(NamedTuple):
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: Optional[int]
+    currsize: int
+    max_bytes: Optional[int]
+    currbytes: int
+
+
+class LRUCache:
+    """A least recently used cache of `bytes` values.
+
+    The cache is bounded by number of entries (`maxsize`) and, optionally,
+    by the total size of its values (`max_bytes`). Entries older than `ttl`
+    seconds are treated as missing. Either bound may be None.
+    """
+
+    def __init__(
+            self, maxsize: Optional[int] = 1024, *,
+            ttl: Optional[float] = None,
+            max_bytes: Optional[int] = None,
+            timer: Callable[[], float] = time.monotonic
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._timer = timer
+        self._data: 'OrderedDict[Hashable, Tuple[bytes, float]]' = \
+            OrderedDict()
+        self._bytes = 0
+        # Stamp of the last write of recently written keys.
+        self._clock = 0
+        self._written: 'OrderedDict[Hashable, int]' = OrderedDict()
+        # Latest stamp forgotten from `_written`.
+        self._forgotten = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Get the value of `key`, or None if it is missing or expired."""
+        try:
+            value, expires = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        if self.ttl is not None and expires <= self._timer():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def stamp(self) -> int:
+        """Get a stamp of the current state of the cache, to be passed to
+        `set` as `since`.
+        """
+        return self._clock
+
+    def set(
+            self, key: Hashable, value: bytes, *,
+            since: Optional[int] = None
+    ) -> None:
+        """Set the value of `key`, evicting the least recently used
+        entries if the cache is full.
+
+        If `since` is given, nothing is set if `key` was set or
+        invalidated after `stamp` returned it.
+        """
+        if since is not None and (
+                since < self._forgotten
+                or self._written.get(key, since) > since
+        ):
+            return
+        if self.max_bytes is not None and len(value) > self.max_bytes:
+            # Would evict everything else and still not fit.
+            self.invalidate(key)
+            return
+        self.invalidate(key)
+        expires = self._timer() + self.ttl if self.ttl is not None else 0.0
+        self._data[key] = (value, expires)
+        self._bytes += len(value)
+        while (
+            (self.maxsize is not None and len(self._data) > self.maxsize)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            self._remove(next(iter(self._data)))
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove `key` from the cache if it is present."""
+        if key in self._data:
+            self._remove(key)
+        self._clock += 1
+        self._written[key] = self._clock
+        self._written.move_to_end(key)
+        if len(self._written) > _WRITE_LOG_SIZE:
+            _, self._forgotten = self._written.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._bytes = 0
+        self._written.clear()
+        self._forgotten = self._clock
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits, self.misses, self.evictions,
+            self.maxsize, len(self._data),
+            self.max_bytes, self._bytes
+        )
+
+    def _remove(self, key: Hashable) -> None:
+        value, _ = self._data.pop(key)
+        self._bytes -= len(value)
@@ -0,0 +1,90 @@
+"""
+Pluggable JSON encoding for the bodies of requests and responses.
+
+A `JsonCodec` bundles a ``dumps``/``loads`` pair. ``dumps`` may return
+either ``str`` or ``bytes``; encoders that return bytes, e.g. ``orjson``,
+skip the extra str-to-bytes re-encode that ``web.json_response`` does.
+
+    import orjson
+    from laviewset import JsonCodec, set_json_codec
+
+    set_json_codec(JsonCodec(orjson.dumps, orjson.loads))
+"""
+import json
+from typing import Any, Callable, Mapping, Optional, Union
+
+import attr
+from aiohttp import web
+
+__all__ = (
+    'JsonCodec',
+    'get_json_codec',
+    'set_json_codec',
+)
+
+JSON_CONTENT_TYPE = 'application/json'
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class JsonCodec:
+
+    dumps: Callable[[Any], Union[str, bytes]] = json.dumps
+    loads: Callable[[Union[str, bytes]], Any] = json.loads
+
+    def encode(self, obj: Any) -> bytes:
+        """Encode `obj` into a JSON document."""
+        body = self.dumps(obj)
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        return body
+
+    def decode(self, body: bytes) -> Any:
+        """Decode a JSON document or raise a `web.HTTPBadRequest`."""
+        try:
+            return self.loads(body)
+        except ValueError as e:
+            raise web.HTTPBadRequest(text=f'Malformed JSON: {e}') from None
+
+    def response(
+            self, data: Any, *,
+            status: int = 200,
+            headers: Optional[Mapping[str, str]] = None
+    ) -> web.Response:
+        """Drop-in replacement for `web.json_response`."""
+        return json_body_response(
+            self.encode(data), status=status, headers=headers
+        )
+
+    async def read(self, request: web.Request) -> Any:
+        """Drop-in replacement for `web.Request.json`."""
+        return self.decode(await request.read())
+
+
+def json_body_response(
+        body: bytes, *,
+        status: int = 200,
+        headers: Optional[Mapping[str, str]] = None
+) -> web.Response:
+    """Create a response from an already encoded JSON document."""
+    return web.Response(
+        body=body,
+        status=status,
+        headers=headers,
+        content_type=JSON_CONTENT_TYPE
+    )
+
+
+_default_codec = JsonCodec()
+
+
+def get_json_codec() -> JsonCodec:
+    """Get the codec used by ViewSets that do not set `json_codec`."""
+    return _default_codec
+
+
+def set_json_codec(codec: JsonCodec) -> None:
+    """Set the codec used by ViewSets that do not set `json_codec`."""
+    global _default_codec
+    if not isinstance(codec, JsonCodec):
+        raise TypeError(f"Can't set JSON codec with type {type(codec)}")
+    _default_codec = codec
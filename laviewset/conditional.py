@@ -0,0 +1,49 @@
+"""
+Helpers for conditional GET requests, i.e. ``ETag`` and ``If-None-Match``.
+"""
+import hashlib
+from typing import Any
+
+from aiohttp import hdrs, web
+
+__all__ = (
+    'make_etag',
+    'make_version_etag',
+    'etag_matches',
+    'not_modified',
+)
+
+
+def make_etag(body: bytes) -> str:
+    """Create a strong entity tag from an encoded response body."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def make_version_etag(*versions: Any) -> str:
+    """Create an entity tag from the version(s) of what a response
+    holds, e.g. the values of a version or `updated_at` column.
+    """
+    return make_etag(repr(versions).encode())
+
+
+def etag_matches(request: web.Request, etag: str) -> bool:
+    """Check whether `etag` matches the request's ``If-None-Match``,
+    using the weak comparison prescribed by RFC 7232.
+    """
+    header = request.headers.get(hdrs.IF_NONE_MATCH)
+    if header is None:
+        return False
+    if header.strip() == '*':
+        return True
+    etag = etag[2:] if etag.startswith('W/') else etag
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> web.Response:
+    return web.Response(status=304, headers={hdrs.ETAG: etag})
@@ -0,0 +1,81 @@
+"""
+Typed path converters.
+
+Variable resources in `@route` paths may name a converter instead of a
+regex, e.g. ``{pk:int}``. The converter's regex is used to match the
+path and the matched value is converted before being passed to the view:
+
+    @route('/{pk:int}', HttpMethods.GET)
+    async def retrieve(self, request, *, pk):
+        # `pk` is an int.
+        ...
+
+Other converters can be added with `register_converter`.
+"""
+import re
+import uuid
+from typing import Any, Callable, Dict, NamedTuple, Tuple
+
+__all__ = (
+    'Converter',
+    'register_converter',
+    'expand_converters',
+)
+
+
+class Converter(NamedTuple):
+
+    regex: str
+    convert: Callable[[str], Any]
+
+
+_converters: Dict[str, Converter] = {
+    'int': Converter(r'\d+', int),
+    'str': Converter(r'[^{}/]+', str),
+    'slug': Converter(r'[-a-zA-Z0-9_]+', str),
+    'uuid': Converter(
+        r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-'
+        r'[0-9a-fA-F]{4}-[0-9a-fA-F]{12}',
+        uuid.UUID
+    ),
+}
+
+# Same as aiohttp's variable resources: `{name}` or `{name:regex}`, where
+# the regex may hold one level of braces, e.g. `{pk:\d{3}}`.
+_VARIABLE_RE = re.compile(
+    r'\{(?P<name>[_a-zA-Z][_a-zA-Z0-9]*)'
+    r'(?::(?P<spec>[^{}]*(?:\{[^{}]*\}[^{}]*)*))?\}'
+)
+
+
+def register_converter(
+        name: str, regex: str,
+        convert: Callable[[str], Any]
+) -> None:
+    """Register a converter for paths such as ``{var:name}``.
+
+    `convert` is called with the matched string and may raise a
+    `ValueError`, which is answered with a ``404 Not Found``.
+    """
+    _converters[name] = Converter(regex, convert)
+
+
+def expand_converters(
+        path: str
+) -> Tuple[str, Dict[str, Callable[[str], Any]]]:
+    """Replace the converters of `path` by their regex.
+
+    Return the path understood by aiohttp and the conversion function
+    of each converted variable.
+    """
+    converters: Dict[str, Callable[[str], Any]] = {}
+
+    def expand(match: 're.Match[str]') -> str:
+        name, spec = match.group('name', 'spec')
+        converter = _converters.get(spec)
+        if converter is None:
+            return match.group(0)
+        converters[name] = converter.convert
+        return f'{{{name}:{converter.regex}}}'
+
+    return _VARIABLE_RE.sub(expand, path), converters
@@ -0,0 +1,82 @@
+"""
+Total row counts for list views.
+
+An exact ``COUNT(*)`` has to visit every matching row, which can take
+seconds on large tables. Estimated counts instead read the planner's
+statistics: ``pg_class.reltuples`` for a whole table, or the row estimate
+of ``EXPLAIN`` for a filtered list.
+"""
+import json
+from typing import Any, Mapping, Optional
+
+import sqlalchemy as sa
+
+__all__ = (
+    'EXACT',
+    'ESTIMATED',
+    'COUNT_MODES',
+    'count_rows',
+)
+
+EXACT = 'exact'
+ESTIMATED = 'estimated'
+COUNT_MODES = (None, EXACT, ESTIMATED)
+
+_RELTUPLES = sa.text(
+    'SELECT reltuples::bigint FROM pg_class '
+    'WHERE oid = CAST(:table AS regclass)'
+)
+
+
+def _regclass(table: sa.Table) -> str:
+    parts = [table.schema, table.name] if table.schema else [table.name]
+    return '.'.join('"{}"'.format(p.replace('"', '""')) for p in parts)
+
+
+async def _exact_count(model, whereclause, params):
+    query = model.__metadata__.select([sa.func.count()]).select_from(
+        model.__table__
+    )
+    if whereclause is not None:
+        query = query.where(whereclause)
+    return await query.gino.scalar(**params)
+
+
+async def _planner_estimate(model, whereclause, params):
+    db = model.__metadata__
+    query = db.select([model.id])
+    if whereclause is not None:
+        query = query.where(whereclause)
+    sql, args = db.compile(query, **params)
+    async with db.acquire() as conn:
+        plan = await conn.raw_connection.fetchval(
+            'EXPLAIN (FORMAT JSON) ' + sql, *args
+        )
+    return int(json.loads(plan)[0]['Plan']['Plan Rows'])
+
+
+async def _estimated_count(model, whereclause, params):
+    if whereclause is None:
+        reltuples = await model.__metadata__.scalar(
+            _RELTUPLES, table=_regclass(model.__table__)
+        )
+        # Tables that were never vacuumed or analyzed have no estimate.
+        if reltuples is not None and reltuples >= 0:
+            return reltuples
+    return await _planner_estimate(model, whereclause, params)
+
+
+async def count_rows(
+        model: Any, mode: str, *,
+        whereclause: Optional[Any] = None,
+        params: Optional[Mapping[str, Any]] = None
+) -> int:
+    """Count the rows of `model` matching `whereclause`, either exactly
+    or estimated from the planner's statistics.
+    """
+    params = params or {}
+    if mode == EXACT:
+        return await _exact_count(model, whereclause, params)
+    if mode == ESTIMATED:
+        return await _estimated_count(model, whereclause, params)
+    raise ValueError(f'Unknown count mode {mode!r}.')
@@ -0,0 +1,134 @@
+"""
+A radix tree based URL dispatcher.
+
+aiohttp's `UrlDispatcher` indexes resources by their static prefix and
+runs the regex of every dynamic resource under the prefix of a request's
+path. `RadixUrlDispatcher` instead compiles the paths of its resources,
+such as those registered by ViewSets, into a tree of path segments once
+the application is frozen. Resolving a path walks the tree one segment
+at a time, and only the resources found at its end are matched.
+
+    from laviewset.dispatch import RadixUrlDispatcher
+
+    app = web.Application(router=RadixUrlDispatcher())
+    base_route = Route.create_base(app.router)
+"""
+from typing import Dict, Iterator, List, Optional
+
+from aiohttp import web
+from aiohttp.abc import AbstractMatchInfo
+from aiohttp.web_urldispatcher import MatchedSubAppResource
+
+__all__ = (
+    'RadixUrlDispatcher',
+)
+
+# Resource types whose paths can be compiled into the tree.
+_TREE_RESOURCES = (web.PlainResource, web.DynamicResource)
+
+
+class _Node:
+
+    __slots__ = ('static', 'dynamic', 'resources')
+
+    def __init__(self) -> None:
+        # Children for static segments, by segment.
+        self.static: Dict[str, _Node] = {}
+        # Child for segments holding variables, e.g. `{pk}`.
+        self.dynamic: Optional[_Node] = None
+        # Resources whose path ends at this node, in registration order.
+        self.resources: List[web.AbstractResource] = []
+
+    def insert(self, segments: List[str]) -> '_Node':
+        node = self
+        for segment in segments:
+            if '{' in segment:
+                if node.dynamic is None:
+                    node.dynamic = _Node()
+                node = node.dynamic
+            else:
+                node = node.static.setdefault(segment, _Node())
+        return node
+
+    def find(self, segments: List[str]) -> Optional['_Node']:
+        """Walk down `segments`, preferring static children, without
+        backtracking.
+        """
+        node = self
+        for segment in segments:
+            child = node.static.get(segment)
+            if child is None:
+                child = node.dynamic
+                if child is None or not segment:
+                    return None
+            node = child
+        return node
+
+    def candidates(
+            self, segments: List[str], i: int = 0
+    ) -> Iterator[web.AbstractResource]:
+        """Yield the resources whose path may match `segments`, those
+        with static segments first.
+        """
+        if i == len(segments):
+            yield from self.resources
+            return
+        segment = segments[i]
+        child = self.static.get(segment)
+        if child is not None:
+            yield from child.candidates(segments, i + 1)
+        # Variables never match an empty segment.
+        if self.dynamic is not None and segment:
+            yield from self.dynamic.candidates(segments, i + 1)
+
+
+class RadixUrlDispatcher(web.UrlDispatcher):
+    """A `web.UrlDispatcher` that resolves plain and dynamic resources
+    through a radix tree of their path segments.
+
+    The tree is built when the router is frozen, i.e. on application
+    startup; until then, and for requests the tree can't resolve,
+    resolution falls back to `web.UrlDispatcher.resolve`. Resources the
+    tree doesn't hold, such as static files, sub-applications or paths
+    with variables spanning several segments, are therefore only
+    matched when no plain or dynamic resource does.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._tree: Optional[_Node] = None
+
+    def freeze(self) -> None:
+        super().freeze()
+        self._tree = self._build_tree()
+
+    def _build_tree(self) -> Optional[_Node]:
+        root = _Node()
+        for resource in self._resources:
+            if isinstance(resource, MatchedSubAppResource):
+                # Domain based sub-applications take precedence over
+                # any path and can't be compiled.
+                return None
+            if type(resource) in _TREE_RESOURCES:
+                segments = resource.canonical.split('/')[1:]
+                root.insert(segments).resources.append(resource)
+        return root
+
+    async def resolve(self, request: web.Request) -> AbstractMatchInfo:
+        tree = self._tree
+        if tree is not None:
+            segments = request.rel_url.raw_path.split('/')[1:]
+            # Most paths only match along the most static branch.
+            node = tree.find(segments)
+            if node is not None:
+                for resource in node.resources:
+                    match_info, _ = await resource.resolve(request)
+                    if match_info is not None:
+                        return match_info
+            for resource in tree.candidates(segments):
+                match_info, _ = await resource.resolve(request)
+                if match_info is not None:
+                    return match_info
+        # Misses, i.e. 404s and 405s, are left to the stock resolution,
+        # which also finds the resources the tree doesn't hold.
+        return await super().resolve(request)
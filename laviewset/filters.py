@@ -0,0 +1,281 @@
+"""
+Declarative filtering and ordering of list views.
+
+A ViewSet whitelists the model attributes clients may filter and order
+on. Query parameters such as ``?status=active&created_gt=2021-01-01``
+and ``?ordering=-created`` are then turned into WHERE and ORDER BY
+clauses, with values coerced according to the column types. Values the
+column can't hold, such as integers out of its range, are rejected.
+
+    class ListingsModelViewSet(ModelViewSet):
+
+        route = listings_route
+        model = ListingsModel
+        serializer_class = ListingsSchema
+        filter_fields = {'status': ['exact', 'in'], 'created': ['gt', 'lt']}
+        ordering_fields = ('created',)
+
+The clauses are built with bind parameters, so requests that filter on
+the same fields with different values share a single cached statement.
+"""
+import datetime
+import operator
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Mapping,
+    Optional,
+    Tuple,
+    Union
+)
+
+import attr
+import sqlalchemy as sa
+from aiohttp import web
+from sqlalchemy.dialects.postgresql import ARRAY
+
+__all__ = (
+    'LOOKUPS',
+    'BoundFilters',
+    'Filters',
+)
+
+
+def _in(column, param):
+    return column == sa.any_(sa.cast(param, ARRAY(column.type)))
+
+
+# Lookups are appended to a field name with an underscore, e.g.
+# `created_gt`. A field name alone is an `exact` lookup.
+LOOKUPS: Dict[str, Callable[[Any, Any], Any]] = {
+    'exact': operator.eq,
+    'gt': operator.gt,
+    'gte': operator.ge,
+    'lt': operator.lt,
+    'lte': operator.le,
+    'in': _in,
+}
+
+# Query parameters used by list views for anything but filtering.
+RESERVED_PARAMS = frozenset((
+    'limit', 'after', 'offset', 'fields', 'ordering'
+))
+
+_SHAPE_CACHE_SIZE = 256
+
+_TRUE = frozenset(('true', '1', 'yes', 'on'))
+_FALSE = frozenset(('false', '0', 'no', 'off'))
+
+
+# Integer column types by bit size, subclasses first.
+_INT_BITS = ((sa.SmallInteger, 16), (sa.BigInteger, 64), (sa.Integer, 32))
+
+
+def int_range(column_type: Any) -> Optional[range]:
+    """Get the range of the values of an integer column type, or None
+    for any other type.
+    """
+    for int_type, bits in _INT_BITS:
+        if isinstance(column_type, int_type):
+            return range(-2 ** (bits - 1), 2 ** (bits - 1))
+    return None
+
+
+def ranged_int(values: range) -> Callable[[Any], int]:
+    """Get a function converting values to ints, raising a ValueError
+    for those out of `values`, which the database would reject.
+    """
+
+    def to_int(value: Any) -> int:
+        converted = int(value)
+        if converted not in values:
+            raise ValueError(f'{converted} is out of range.')
+        return converted
+
+    return to_int
+
+
+def _to_str(value: str) -> str:
+    # Postgres can't store NUL characters in text.
+    if '\x00' in value:
+        raise ValueError(value)
+    return value
+
+
+def _to_bool(value: str) -> bool:
+    lowered = value.lower()
+    if lowered in _TRUE:
+        return True
+    if lowered in _FALSE:
+        return False
+    raise ValueError(value)
+
+
+def _coercer(name: str, column: sa.Column) -> Callable[[str], Any]:
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        raise ValueError(
+            f'Can not filter on {name!r}: its column type '
+            f'{column.type!r} has no Python equivalent.'
+        ) from None
+    if python_type is bool:
+        return _to_bool
+    if python_type is str:
+        return _to_str
+    if python_type in (datetime.datetime, datetime.date, datetime.time):
+        return python_type.fromisoformat
+    values = int_range(column.type)
+    if values is not None:
+        return ranged_int(values)
+    return python_type
+
+
+def _get_column(model: Any, name: str) -> sa.Column:
+    column = getattr(model, name, None)
+    if not isinstance(column, sa.Column):
+        raise ValueError(f'{model.__qualname__} has no column {name!r}.')
+    return column
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class BoundFilters:
+    """The filtering and ordering of a single request."""
+
+    whereclause: Optional[Any] = None
+    order_by: Tuple[Any, ...] = ()
+    params: Mapping[str, Any] = attr.Factory(dict)
+    # Identifies the clauses, which are the same for requests filtering
+    # and ordering on the same fields. None if they can't be identified.
+    shape: Optional[Hashable] = None
+
+    @property
+    def ordered(self) -> bool:
+        return bool(self.order_by)
+
+    def apply(self, query: Any) -> Any:
+        """Add the WHERE and ORDER BY clauses to `query`. The query
+        must be executed with `params`.
+        """
+        if self.whereclause is not None:
+            query = query.where(self.whereclause)
+        if self.order_by:
+            query = query.order_by(*self.order_by)
+        return query
+
+
+NO_FILTERS = BoundFilters(shape=())
+
+
+class Filters:
+    """The filtering and ordering whitelist of a model."""
+
+    def __init__(
+            self, model: Any,
+            filter_fields: Union[Iterable[str], Mapping[str, Iterable[str]]],
+            ordering_fields: Iterable[str] = ()
+    ):
+        if not isinstance(filter_fields, Mapping):
+            filter_fields = {name: tuple(LOOKUPS) for name in filter_fields}
+
+        self.model = model
+        # (field, lookup) -> (column, coerce)
+        self._lookups: Dict[Tuple[str, str], Tuple[sa.Column, Any]] = {}
+        for name, lookups in filter_fields.items():
+            column = _get_column(model, name)
+            coerce = _coercer(name, column)
+            for lookup in lookups:
+                if lookup not in LOOKUPS:
+                    raise ValueError(
+                        f'Unknown lookup {lookup!r} for {name!r}.'
+                    )
+                self._lookups[name, lookup] = (column, coerce)
+        self._ordering = {
+            name: _get_column(model, name) for name in ordering_fields
+        }
+        self._shapes: Dict[Any, Tuple[Optional[Any], Tuple[Any, ...]]] = {}
+
+    def _parse_param(self, key: str) -> Tuple[str, str]:
+        if (key, 'exact') in self._lookups:
+            return key, 'exact'
+        name, _, lookup = key.rpartition('_')
+        if (name, lookup) in self._lookups:
+            return name, lookup
+        raise web.HTTPBadRequest(
+            text=f'Filtering on {key!r} is not allowed.'
+        )
+
+    def _parse_ordering(self, value: str) -> Tuple[Tuple[str, bool], ...]:
+        ordering = []
+        for item in value.split(','):
+            item = item.strip()
+            name = item.lstrip('-')
+            if name not in self._ordering:
+                raise web.HTTPBadRequest(
+                    text=f'Ordering by {name!r} is not allowed.'
+                )
+            ordering.append((name, item.startswith('-')))
+        return tuple(ordering)
+
+    def _coerce(self, key: str, shape: Tuple[str, str], value: str) -> Any:
+        _, coerce = self._lookups[shape]
+        try:
+            if shape[1] == 'in':
+                return [coerce(v) for v in value.split(',')]
+            return coerce(value)
+        except (ValueError, ArithmeticError):
+            raise web.HTTPBadRequest(
+                text=f'Invalid value {value!r} for {key!r}.'
+            ) from None
+
+    def bind(self, query: Mapping[str, str]) -> BoundFilters:
+        """Parse the filtering and ordering parameters of a request's
+        query string, raising a `web.HTTPBadRequest` for any parameter
+        that is not whitelisted.
+        """
+        params = {}
+        lookups = []
+        for key in query.keys():
+            bind_name = f'filter_{key}'
+            if key in RESERVED_PARAMS or bind_name in params:
+                continue
+            shape = self._parse_param(key)
+            params[bind_name] = self._coerce(key, shape, query[key])
+            lookups.append((key, shape))
+        lookups.sort()
+
+        ordering: Tuple[Tuple[str, bool], ...] = ()
+        if self._ordering and query.get('ordering'):
+            ordering = self._parse_ordering(query['ordering'])
+
+        if not lookups and not ordering:
+            return NO_FILTERS
+
+        key = (tuple(lookups), ordering)
+        try:
+            whereclause, order_by = self._shapes[key]
+        except KeyError:
+            whereclause, order_by = self._build(lookups, ordering)
+            if len(self._shapes) < _SHAPE_CACHE_SIZE:
+                self._shapes[key] = (whereclause, order_by)
+        return BoundFilters(whereclause, order_by, params, key)
+
+    def _build(self, lookups, ordering):
+        clauses = []
+        for key, shape in lookups:
+            column, _ = self._lookups[shape]
+            param_type = ARRAY(column.type) if shape[1] == 'in' \
+                else column.type
+            clauses.append(LOOKUPS[shape[1]](
+                column, sa.bindparam(f'filter_{key}', type_=param_type)
+            ))
+        whereclause = sa.and_(*clauses) if clauses else None
+        order_by = tuple(
+            self._ordering[name].desc() if desc
+            else self._ordering[name].asc()
+            for name, desc in ordering
+        )
+        return whereclause, order_by
@@ -0,0 +1,468 @@
+"""
+The default `Backend` of ViewSets with a `model`, storing objects in
+Postgres through Gino.
+
+Reads asked for `records` skip Gino: the query selects the columns
+backing the requested attributes, labeled by attribute name, and runs on
+the underlying asyncpg connection, which returns `Row`s instead of
+model instances. Model columns named differently from their attribute,
+e.g. ``nickname = db.Column('name', ...)``, are read under the
+attribute's name. This requires asyncpg >= 0.22.
+
+Lookups, lists, updates and deletes of single rows are compiled once per
+query shape and kept in the backend's `statements`, a
+`laviewset.statements.StatementCache`.
+"""
+import contextlib
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence
+)
+
+import asyncpg
+import sqlalchemy as sa
+from asyncpg.exceptions import UniqueViolationError
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from .backends import ObjectsNotFound, Only, UniqueViolation
+from .counts import count_rows
+from .filters import NO_FILTERS, int_range, ranged_int
+from .statements import StatementCache
+
+__all__ = (
+    'GinoBackend',
+    'Row',
+)
+
+
+class Row(asyncpg.Record):
+    """A record whose values can also be read as attributes, the way
+    serializers read those of model instances.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class GinoBackend:
+    """A `Backend` reading and writing the rows of a Gino `model`.
+
+    Objects are instances of `model`, or `Row`s for reads asked for
+    `records`. Lists and lookups given `only` select just the columns
+    they need, bulk writes run in a single transaction with one
+    statement per group of objects setting the same fields, and `count`
+    supports the modes of `laviewset.counts.count_rows`.
+
+    Up to `statement_cache_size` shapes of queries are compiled once and
+    cached in `statements`, with values passed as bind parameters.
+    """
+
+    filterable = True
+
+    def __init__(
+            self, model: Any, *,
+            statement_cache_size: Optional[int] = 256
+    ):
+        self.model = model
+        self.name = model.__qualname__
+        # Keys out of the range of an integer column match no row.
+        self._pk_range = int_range(model.id.type)
+        if self._pk_range is None:
+            self.pk_type = model.id.type.python_type
+        else:
+            self.pk_type = ranged_int(self._pk_range)
+        self.statements = StatementCache(statement_cache_size)
+
+    def _compile(self, key: Optional[Hashable], build: Any) -> Any:
+        dialect = self.model.__metadata__.bind.dialect
+        return self.statements.get(key, dialect, build)
+
+    def _out_of_range(self, pk: Hashable) -> bool:
+        pk_range = self._pk_range
+        return pk_range is not None and isinstance(pk, int) and \
+            pk not in pk_range
+
+    def _select(self, only: Only, records: bool) -> Any:
+        if records:
+            return _records_query(self.model, only)
+        return _projection(self.model, only)
+
+    async def get(
+            self, pk: Hashable, *,
+            only: Only = None,
+            records: bool = False
+    ) -> Optional[Any]:
+        if self._out_of_range(pk):
+            return None
+        model = self.model
+        records = records and _columns(model, only) is not None
+        statement = self._compile(
+            ('get', only, records),
+            lambda: self._select(only, records).where(
+                model.id == sa.bindparam('_pk')
+            )
+        )
+        if records:
+            return await self._fetch_records(
+                statement, {'_pk': pk}, first=True
+            )
+        return await model.__metadata__.first(statement, _pk=pk)
+
+    async def list(
+            self, page: Any, *,
+            filters: Any = None,
+            only: Only = None,
+            records: bool = False
+    ) -> List[Any]:
+        filters = filters or NO_FILTERS
+        model = self.model
+        records = records and _columns(model, only) is not None
+        params = dict(filters.params)
+        if page.limit is not None:
+            params['_limit'] = page.limit + 1
+            if page.after is not None:
+                params['_after'] = page.after
+            elif page.offset:
+                params['_offset'] = page.offset
+
+        def build():
+            query = filters.apply(self._select(only, records))
+            if '_limit' in params:
+                query = query.order_by(model.id)
+                if '_after' in params:
+                    query = query.where(model.id > sa.bindparam('_after'))
+                elif '_offset' in params:
+                    query = query.offset(_int_param('_offset'))
+                query = query.limit(_int_param('_limit'))
+            return query
+
+        key = None if filters.shape is None else (
+            'list', only, records, filters.shape,
+            '_limit' in params, '_after' in params, '_offset' in params
+        )
+        statement = self._compile(key, build)
+        if records:
+            return await self._fetch_records(statement, params)
+        return await model.__metadata__.all(statement, **params)
+
+    async def iterate(
+            self, *,
+            chunk_size: int,
+            filters: Any = None,
+            only: Only = None,
+            records: bool = False
+    ) -> AsyncIterator[List[Any]]:
+        """Iterate over the rows through a server-side cursor, so that
+        the next chunk is only fetched once the previous one has been
+        consumed.
+        """
+        filters = filters or NO_FILTERS
+        model = self.model
+        metadata = model.__metadata__
+        records = records and _columns(model, only) is not None
+        key = None if filters.shape is None else (
+            'iterate', only, records, filters.shape
+        )
+        statement = self._compile(key, lambda: filters.apply(
+            self._select(only, records)
+        ).order_by(model.id))
+        async with metadata.transaction() as tx:
+            if records:
+                sql, args = metadata.compile(statement, **filters.params)
+                cursor = await tx.connection.raw_connection.cursor(
+                    sql, *args, record_class=Row
+                )
+                fetch = cursor.fetch
+            else:
+                cursor = await tx.connection.iterate(
+                    statement, **filters.params
+                )
+                fetch = cursor.many
+            while True:
+                rows = await fetch(chunk_size)
+                if not rows:
+                    break
+                yield rows
+
+    async def _fetch_records(
+            self, statement: Any, params: Mapping[str, Any], *,
+            first: bool = False
+    ) -> Any:
+        metadata = self.model.__metadata__
+        sql, args = metadata.compile(statement, **params)
+        async with metadata.acquire(reuse=True) as conn:
+            raw = conn.raw_connection
+            if first:
+                return await raw.fetchrow(sql, *args, record_class=Row)
+            return await raw.fetch(sql, *args, record_class=Row)
+
+    async def count(self, filters: Any = None, *, mode: str) -> int:
+        filters = filters or NO_FILTERS
+        return await count_rows(
+            self.model, mode,
+            whereclause=filters.whereclause,
+            params=filters.params
+        )
+
+    async def create(self, values: Mapping[str, Any]) -> Any:
+        with _unique_violation():
+            # `create` inserts with `INSERT ... RETURNING`, so the
+            # object holds the row as it was stored.
+            return await self.model.create(**values)
+
+    async def update(
+            self, pk: Hashable, values: Mapping[str, Any]
+    ) -> Optional[Any]:
+        """Update the row with `pk` using a single `UPDATE ... RETURNING`
+        statement.
+        """
+        if not values or self._out_of_range(pk):
+            return await self.get(pk)
+        model = self.model
+        names = tuple(sorted(values))
+        statement = self._compile(
+            ('update', names), lambda: _update_query(model, names)
+        )
+        params = {f'_set_{name}': values[name] for name in names}
+        with _unique_violation():
+            return await model.__metadata__.first(
+                statement, _pk=pk, **params
+            )
+
+    async def update_object(
+            self, obj: Any, values: Mapping[str, Any]
+    ) -> Any:
+        with _unique_violation():
+            await obj.update(**values).apply()
+        return obj
+
+    async def delete(self, pk: Hashable) -> bool:
+        """Delete the row with `pk` using a single `DELETE ... RETURNING`
+        statement, without building a model instance.
+        """
+        if self._out_of_range(pk):
+            return False
+        model = self.model
+        statement = self._compile(
+            ('delete',),
+            lambda: model.delete.where(
+                model.id == sa.bindparam('_pk')
+            ).returning(model.id)
+        )
+        deleted = await model.__metadata__.scalar(statement, _pk=pk)
+        return deleted is not None
+
+    async def delete_object(self, obj: Any) -> None:
+        await obj.delete()
+
+    async def bulk_create(
+            self, items: Sequence[Mapping[str, Any]]
+    ) -> List[Any]:
+        model = self.model
+        # A multi-row INSERT needs the same columns in every row, so
+        # rows are grouped by the fields they set.
+        created: List[Any] = [None] * len(items)
+        with _unique_violation():
+            async with model.__metadata__.transaction() as tx:
+                for indices in _group_by_fields(items):
+                    query = model.insert().values([
+                        _column_values(model, items[i])
+                        for i in indices
+                    ]).returning(*model).execution_options(loader=model)
+                    rows = await tx.connection.all(query)
+                    for i, obj in zip(indices, rows):
+                        created[i] = obj
+        return created
+
+    async def bulk_update(
+            self, pks: Sequence[Hashable],
+            items: Sequence[Mapping[str, Any]]
+    ) -> Dict[Hashable, Any]:
+        model = self.model
+        # Objects setting the same fields are updated together
+        # with a single `UPDATE ... FROM (SELECT unnest(...))`.
+        updated = {}
+        with _unique_violation():
+            async with model.__metadata__.transaction() as tx:
+                for indices in _group_by_fields(items):
+                    group_pks = [pks[i] for i in indices]
+                    names = sorted(items[indices[0]])
+                    if not names:
+                        query = model.query.where(model.id == sa.any_(
+                            _array_param(model.id, group_pks)
+                        ))
+                    else:
+                        query = _bulk_update_query(model, group_pks, {
+                            name: [items[i][name] for i in indices]
+                            for name in names
+                        })
+                    for obj in await tx.connection.all(query):
+                        updated[obj.id] = obj
+                missing = [pk for pk in pks if pk not in updated]
+                if missing:
+                    # Leaving the transaction with an error rolls
+                    # it back.
+                    raise ObjectsNotFound(missing)
+        return updated
+
+    async def bulk_delete(self, pks: Sequence[Hashable]) -> None:
+        model = self.model
+        async with model.__metadata__.transaction() as tx:
+            deleted = await tx.connection.all(
+                model.delete.where(
+                    model.id == sa.any_(_array_param(model.id, pks))
+                ).returning(model.id)
+            )
+            deleted = {obj.id for obj in deleted}
+            missing = [pk for pk in pks if pk not in deleted]
+            if missing:
+                raise ObjectsNotFound(missing)
+
+    async def delete_filtered(
+            self, filters: Any, *, limit: int
+    ) -> Optional[List[Hashable]]:
+        """Delete the matching rows with a single `DELETE ... RETURNING`
+        statement, rolled back if it deleted more than `limit` rows.
+        """
+        model = self.model
+        key = None if filters.shape is None else (
+            'delete_filtered', filters.shape
+        )
+        statement = self._compile(key, lambda: model.delete.where(
+            filters.whereclause
+        ).returning(model.id))
+        async with model.__metadata__.transaction() as tx:
+            deleted = await tx.connection.all(statement, **filters.params)
+            if len(deleted) > limit:
+                tx.raise_rollback()
+            return [row.id for row in deleted]
+        return None
+
+
+@contextlib.contextmanager
+def _unique_violation() -> Iterator[None]:
+    try:
+        yield
+    except UniqueViolationError as e:
+        raise UniqueViolation(e.constraint_name, e.detail) from e
+
+
+def _group_by_fields(
+        items: Sequence[Mapping[str, Any]]
+) -> List[List[int]]:
+    """Group the indices of `items` by the fields they set."""
+    groups: Dict[Any, List[int]] = {}
+    for i, values in enumerate(items):
+        groups.setdefault(tuple(sorted(values)), []).append(i)
+    return list(groups.values())
+
+
+def _columns(model, only):
+    """Get the columns backing the attributes `only`, plus the primary
+    key, by attribute name.
+
+    Return None if `only` is None or if one of the attributes isn't a
+    column, in which case every column has to be loaded.
+    """
+    if only is None:
+        return None
+    columns = {'id': model.id}
+    for name in only:
+        column = getattr(model, name, None)
+        if not isinstance(column, sa.Column):
+            return None
+        columns[name] = column
+    return columns
+
+
+def _records_query(model, only):
+    """Build a query that selects the columns backing the attributes
+    `only`, plus the primary key, labeled by attribute name.
+
+    Return None if `only` is None or if one of the attributes isn't a
+    column, in which case model instances have to be loaded.
+    """
+    columns = _columns(model, only)
+    if columns is None:
+        return None
+    return model.__metadata__.select([
+        column.label(name) for name, column in columns.items()
+    ])
+
+
+def _projection(model, only):
+    """Build a query that only selects the columns backing the
+    attributes `only`, plus the primary key, and loads them into model
+    instances.
+
+    Every column is selected if `only` is None or if one of the
+    attributes isn't a column.
+    """
+    columns = _columns(model, only)
+    if columns is None:
+        return model.query
+    return model.__metadata__.select(
+        list(dict.fromkeys(columns.values()))
+    ).execution_options(loader=model)
+
+
+def _int_param(name):
+    return sa.bindparam(name, type_=sa.Integer)
+
+
+def _array_param(column, values):
+    array = ARRAY(column.type)
+    return sa.cast(sa.bindparam(None, values, type_=array), array)
+
+
+def _bulk_update_query(model, pks, values):
+    """Build an `UPDATE ... FROM (SELECT unnest(...)) ... RETURNING`
+    query setting `values[name][i]` on the row with `pks[i]`.
+    """
+    columns = {name: getattr(model, name) for name in values}
+    source = sa.select([
+        sa.func.unnest(_array_param(model.id, pks)).label('_pk')
+    ] + [
+        sa.func.unnest(_array_param(column, values[name])).label(name)
+        for name, column in columns.items()
+    ]).alias('_values')
+    return model.update.values({
+        column: source.c[name] for name, column in columns.items()
+    }).where(
+        model.id == source.c._pk
+    ).returning(*model).execution_options(loader=model)
+
+
+def _update_query(model, names):
+    """Build an `UPDATE ... RETURNING` query setting the attributes
+    `names` of the row with the primary key `_pk`, each from the
+    parameter `_set_<name>`.
+    """
+    values = {}
+    for name in names:
+        column = getattr(model, name)
+        values[column] = sa.bindparam(f'_set_{name}', type_=column.type)
+    return model.update.values(values).where(
+        model.id == sa.bindparam('_pk')
+    ).returning(*model).execution_options(loader=model)
+
+
+def _column_values(model, values):
+    """Key `values`, given by model attribute name, by column instead,
+    since the name of the column may differ from the attribute's.
+    """
+    return {
+        getattr(model, attr): value for attr, value in values.items()
+    }
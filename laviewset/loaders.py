@@ -0,0 +1,104 @@
+"""
+Batching of primary key lookups.
+
+A `PrimaryKeyLoader` collects the lookups made within one iteration of
+the event loop, or within a configurable window, and fetches them all
+with a single ``WHERE id = ANY($1)`` query.
+
+    listings_loader = PrimaryKeyLoader(ListingsModel)
+
+    class ListingsModelViewSet(ModelViewSet):
+
+        route = listings_route
+        model = ListingsModel
+        serializer_class = ListingsSchema
+        loader = listings_loader
+
+        @route('/{pk}/summary', HttpMethods.GET)
+        async def summary(self, request, *, pk):
+            listing = await self.get_object(pk)
+            ...
+"""
+import asyncio
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY
+
+__all__ = (
+    'PrimaryKeyLoader',
+)
+
+
+class PrimaryKeyLoader:
+    """Load instances of `model` by primary key, in batches.
+
+    Lookups are collected for `window` seconds, or until the next
+    iteration of the event loop if `window` is 0, and fetched at most
+    `max_batch_size` at a time. Lookups for the same key made while it
+    is pending share its result. Nothing is cached once a batch has been
+    fetched, so later lookups always see fresh rows.
+    """
+
+    def __init__(
+            self, model: Any, *,
+            window: float = 0.0,
+            max_batch_size: int = 1000
+    ):
+        self.model = model
+        self.window = window
+        self.max_batch_size = max_batch_size
+        array = ARRAY(model.id.type)
+        self._query = model.query.where(model.id == sa.any_(
+            sa.cast(sa.bindparam('pks', type_=array), array)
+        ))
+        self._pending: Dict[Hashable, 'asyncio.Future[Any]'] = {}
+        self._scheduled = False
+
+    async def load(self, pk: Hashable) -> Optional[Any]:
+        """Load the instance with primary key `pk`, or None if there is
+        no such row.
+        """
+        fut = self._pending.get(pk)
+        if fut is None:
+            loop = asyncio.get_event_loop()
+            fut = self._pending[pk] = loop.create_future()
+            if not self._scheduled:
+                self._scheduled = True
+                if self.window > 0:
+                    loop.call_later(self.window, self._dispatch)
+                else:
+                    loop.call_soon(self._dispatch)
+        # Shielded, so a cancelled lookup doesn't cancel the others
+        # waiting for the same key.
+        return await asyncio.shield(fut)
+
+    async def load_many(
+            self, pks: Iterable[Hashable]
+    ) -> List[Optional[Any]]:
+        """Load the instances with primary keys `pks`, in order."""
+        return list(await asyncio.gather(*(self.load(pk) for pk in pks)))
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        self._scheduled = False
+        items = list(pending.items())
+        for i in range(0, len(items), self.max_batch_size):
+            asyncio.ensure_future(
+                self._fetch(dict(items[i:i + self.max_batch_size]))
+            )
+
+    async def _fetch(self, batch: Dict[Hashable, 'asyncio.Future[Any]']):
+        try:
+            rows = await self._query.gino.all(pks=list(batch))
+        except Exception as e:
+            for fut in batch.values():
+                if not fut.done():
+                    fut.set_exception(e)
+                    # Retrieved by each waiter, if any are left.
+                    fut.exception()
+            return
+        found = {row.id: row for row in rows}
+        for pk, fut in batch.items():
+            if not fut.done():
+                fut.set_result(found.get(pk))
@@ -1,7 +1,28 @@
-from aiohttp import web
+import asyncio
+import contextlib
+
+from aiohttp import hdrs, web
 from marshmallow import ValidationError
 
+from .backends import ObjectsNotFound, UniqueViolation, load_pk
+from .codec import json_body_response
+from .conditional import (
+    etag_matches,
+    make_etag,
+    make_version_etag,
+    not_modified
+)
 from .http_meths import HttpMethods
+from .pagination import get_page_params, next_page_link
+
+
+NDJSON = 'application/x-ndjson'
+TOTAL_COUNT = 'X-Total-Count'
+
+_BULK_DELETE_USAGE = (
+    'Pass the primary keys to delete as "?id=1,2,3", or filter the '
+    'objects to delete.'
+)
 
 
 # Credit to SO user ShadowRanger:
@@ -45,73 +66,246 @@ def make_mixin(path, method, handler_name):
 @make_mixin('/', HttpMethods.GET, 'list')
 class ListMixin:
 
-    async def list(self, request):
-        l = await self.model.query.gino.all()
-        serializer = self.get_serializer(many=True)
-        data = serializer.dump(l)
-        return web.json_response(data)
-
+    # Default number of objects per page and the largest page
+    # a client may ask for through `?limit=`. A `page_size` of None
+    # disables pagination unless the client asks for a page.
+    page_size = 100
+    max_page_size = 1000
+
+    # Stream the whole list as newline delimited JSON, fetching
+    # `stream_chunk_size` rows at a time from a server-side cursor.
+    # Clients can also opt in with `Accept: application/x-ndjson`.
+    stream = False
+    stream_chunk_size = 500
+
+    # Model attributes clients may filter on, e.g. `?status=active` or
+    # `?created_gt=2021-01-01`. Either a sequence of names, allowing
+    # every lookup, or a mapping of names to their allowed lookups.
+    # Filtering on anything else is rejected.
+    filter_fields = ()
+    # Model attributes clients may order by, e.g. `?ordering=-created`.
+    ordering_fields = ()
+
+    # Add an `X-Total-Count` header to paginated lists. Either
+    # 'exact', which runs a COUNT(*), 'estimated', which reads the
+    # planner's statistics, or None. The count runs concurrently
+    # with the page query, and `HEAD` requests only get the count.
+    count_mode = None
+
+    # Read rows as records holding the serializer's attributes, through
+    # the backend's fast path if it has one, e.g. asyncpg Records
+    # instead of Gino model instances. Serializers reading anything but
+    # model columns, e.g. through `fields.Method`, still get objects.
+    use_records = False
 
-@make_mixin(r'/{pk:\d+}', HttpMethods.GET, 'retrieve')
+    async def list(self, request):
+        backend = self.get_backend()
+        filters = _bind_filters(self, request)
+        if request.method == hdrs.METH_HEAD:
+            # aiohttp routes HEAD requests to GET handlers. Only
+            # answer with the count, without fetching any rows.
+            headers = {}
+            if self.count_mode is not None:
+                headers[TOTAL_COUNT] = str(await _count(self, filters))
+            return web.Response(headers=headers)
+
+        fields = _parse_fields(self, request)
+        only = _read_attributes(self, fields)
+        records = self.use_records
+        dump = self.get_dumper(many=True, **_only(fields))
+        if self.stream or NDJSON in request.headers.get(hdrs.ACCEPT, ''):
+            return await _stream_ndjson(
+                request, backend, dump,
+                self.get_codec(),
+                chunk_size=self.stream_chunk_size,
+                filters=filters,
+                only=only,
+                records=records
+            )
+
+        page = get_page_params(
+            request.query,
+            page_size=self.page_size,
+            max_page_size=self.max_page_size,
+            pk_type=backend.pk_type
+        )
+        if filters is not None and filters.ordered:
+            # Cursors are keyed by primary key, so ordered lists are
+            # paginated by offset.
+            if page.after is not None:
+                raise web.HTTPBadRequest(
+                    text='"after" can not be used with "ordering".'
+                )
+            if page.limit is not None and page.offset is None:
+                page = page._replace(offset=0)
+
+        etag = None
+        if self.etag_column is not None:
+            # Cheaply check whether the client's copy of the page is
+            # still fresh before fetching and serializing it.
+            column = self.etag_column
+            versions = await backend.list(
+                page, filters=filters, only=('id', column), records=True
+            )
+            etag = make_version_etag(*(
+                (obj.id, getattr(obj, column))
+                for obj in versions[:page.limit]
+            ))
+            if fields is not None:
+                etag = make_version_etag(etag, fields)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+
+        async def render():
+            count = None
+            if self.count_mode is not None and page.limit is not None:
+                count = asyncio.ensure_future(_count(self, filters))
+            try:
+                l = await backend.list(
+                    page, filters=filters, only=only, records=records
+                )
+            except BaseException:
+                if count is not None:
+                    count.cancel()
+                raise
+
+            headers = {}
+            if count is not None:
+                headers[TOTAL_COUNT] = str(await count)
+            if page.limit is not None and len(l) > page.limit:
+                l = l[:page.limit]
+                headers['Link'] = next_page_link(
+                    request.url, page, last=l[-1].id
+                )
+            return self.get_codec().encode(dump(l)), headers
+
+        # The URL holds every parameter the page depends on.
+        body, headers = await _coalesce(self, request, render, request.url)
+        headers = dict(headers)
+        if etag is None:
+            etag = make_etag(body)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+        headers[hdrs.ETAG] = etag
+        return json_body_response(body, headers=headers)
+
+
+@make_mixin('/{pk:int}', HttpMethods.GET, 'retrieve')
 class RetrieveMixin:
 
-    async def retrieve(self, request, *, pk):
-        obj = await _get_or_404(self.model, pk)
-        serializer = self.get_serializer()
-        data = serializer.dump(obj)
-        return web.json_response(data)
-
+    # See ListMixin.use_records. Lookups of records bypass the
+    # ViewSet's `loader`.
+    use_records = False
 
-@make_mixin(r'/{pk:\d+}', HttpMethods.DELETE, 'delete')
+    async def retrieve(self, request, *, pk):
+        fields = _parse_fields(self, request)
+        etag = None
+        if self.etag_column is not None:
+            etag = await _version_etag_or_404(self, pk)
+            if fields is not None:
+                etag = make_version_etag(etag, fields)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+
+        # Only whole objects are cached.
+        cache = self.cache if fields is None else None
+        body = cache.get(pk) if cache is not None else None
+        if body is None:
+            # Writes made while the object is fetched win over it.
+            since = cache.stamp() if cache is not None else None
+
+            async def render():
+                obj = await self.get_object(
+                    pk, only=_read_attributes(self, fields),
+                    records=self.use_records
+                )
+                body = self.get_codec().encode(
+                    self.get_dumper(**_only(fields))(obj)
+                )
+                if cache is not None:
+                    cache.set(pk, body, since=since)
+                return body
+
+            body = await _coalesce(self, request, render, fields)
+
+        if etag is None:
+            etag = make_etag(body)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+        return json_body_response(body, headers={hdrs.ETAG: etag})
+
+
+@make_mixin('/{pk:int}', HttpMethods.DELETE, 'delete')
 class DestroyMixin:
 
+    # Delete the object by primary key, e.g. with a single
+    # `DELETE ... RETURNING` statement, instead of fetching it first.
+    use_returning = False
+
     async def delete(self, request, *, pk):
-        obj = await _get_or_404(self.model, pk)
-        await obj.delete()
+        backend = self.get_backend()
+        if self.use_returning:
+            if not await backend.delete(pk):
+                _raise_404(backend, pk)
+        else:
+            await backend.delete_object(await self.get_object(pk))
+        _invalidate_cached(self, [pk])
         return web.json_response(status=204)
 
 
-@make_mixin(r'/{pk:\d+}', HttpMethods.PUT, 'update')
+@make_mixin('/{pk:int}', HttpMethods.PUT, 'update')
 class UpdateMixin:
 
+    # Update the object by primary key, e.g. with a single
+    # `UPDATE ... RETURNING` statement, instead of fetching it first.
+    use_returning = False
+
     async def update(self, request, *, pk):
-        data = await request.json()
+        data = await self.read_json(request)
         serializer = self.get_serializer()
-        model = self.model
         cleaned_data = _validate_or_raise(serializer, data)
-        obj = await _get_or_404(model, pk)
-        await obj.update(**cleaned_data).apply()
-        resp_data = serializer.dump(obj)
-        return web.json_response(data=resp_data)
+        obj = await _update(self, pk, cleaned_data)
+        return _write_through(self, pk, obj)
 
 
-@make_mixin(r'/{pk:\d+}', HttpMethods.PATCH, 'partial_update')
+@make_mixin('/{pk:int}', HttpMethods.PATCH, 'partial_update')
 class PartialUpdateMixin:
 
+    # See UpdateMixin.use_returning.
+    use_returning = False
+
     async def partial_update(self, request, *, pk):
-        data = await request.json()
+        data = await self.read_json(request)
         serializer = self.get_serializer(partial=True)
-        model = self.model
         cleaned_data = _validate_or_raise(serializer, data)
-        obj = await _get_or_404(model, pk)
-        await obj.update(**cleaned_data).apply()
-        resp_data = serializer.dump(obj)
-        return web.json_response(data=resp_data)
+        obj = await _update(self, pk, cleaned_data)
+        return _write_through(self, pk, obj)
 
 
 @make_mixin('/', HttpMethods.POST, 'create')
 class CreateMixin:
 
+    # A JSON array body creates all of its objects in one transaction.
+    # `max_bulk_size` bounds the size of such a batch, and at most
+    # `bulk_validation_concurrency` objects are run through the
+    # serializer's `is_valid` at a time.
+    max_bulk_size = 1000
+    bulk_validation_concurrency = 10
+
     async def create(self, request):
-        data = await request.json()
+        data = await self.read_json(request)
+        if isinstance(data, list):
+            return await _bulk_create(self, data)
         serializer = self.get_serializer()
-        model = self.model
-        cleaned_data = serializer.load(data)
+        cleaned_data = _validate_or_raise(serializer, data)
         await serializer.is_valid(cleaned_data, raise_exception=True)
-        u = await model.create(**cleaned_data)
+        # Unique constraints are left to the backend rather than
+        # checked beforehand; see GenericViewSet.unique_violation_messages.
+        with _unique_violation_as_400(self):
+            u = await self.get_backend().create(cleaned_data)
         headers = self.get_success_headers(f"{request.url}/{u.id}")
-        return web.json_response(
-            data=cleaned_data,
+        return self.json_response(
+            self.get_dumper()(u),
             status=201,
             headers=headers
         )
@@ -121,24 +315,388 @@ class CreateMixin:
         return {'Location': loc}
 
 
+@make_mixin('/', HttpMethods.PATCH, 'bulk_partial_update')
+class BulkPartialUpdateMixin:
+
+    # See CreateMixin.max_bulk_size.
+    max_bulk_size = 1000
+
+    async def bulk_partial_update(self, request):
+        data = await self.read_json(request)
+        if not isinstance(data, list):
+            raise web.HTTPBadRequest(text='Expected a list of objects.')
+        _check_bulk_size(self, len(data))
+
+        backend = self.get_backend()
+        pks, cleaned, errors = _load_bulk_partial(self, data)
+        if errors:
+            return self.json_response({'errors': errors}, status=400)
+
+        with _unique_violation_as_400(self), _objects_not_found_as_404(self):
+            updated = await backend.bulk_update(pks, cleaned)
+        _invalidate_cached(self, pks)
+
+        data = self.get_dumper(many=True)([updated[pk] for pk in pks])
+        return self.json_response(data)
+
+
+@make_mixin('/', HttpMethods.DELETE, 'bulk_delete')
+class BulkDestroyMixin:
+
+    # See CreateMixin.max_bulk_size.
+    max_bulk_size = 1000
+
+    async def bulk_delete(self, request):
+        backend = self.get_backend()
+        if 'id' not in request.query:
+            return await _delete_filtered(self, request)
+        if any(key != 'id' for key in request.query):
+            raise web.HTTPBadRequest(
+                text='"id" can not be used with other parameters.'
+            )
+        pks = _parse_pk_list(backend, request.query.getall('id'))
+        if not pks:
+            raise web.HTTPBadRequest(text=_BULK_DELETE_USAGE)
+        _check_bulk_size(self, len(pks))
+
+        with _objects_not_found_as_404(self):
+            await backend.bulk_delete(pks)
+
+        _invalidate_cached(self, pks)
+        return web.json_response(status=204)
+
+
 class SerializerMixin:
 
     async def is_valid(self, *args, **kwargs) -> None:
-        raise NotImplementedError()
+        """Validate deserialized data before it is written.
+
+        There is no need to query the database here to check unique
+        fields: violated unique constraints are answered with a 400 by
+        the mixins themselves.
+        """
 
     def not_valid(self, *, msg: str = ''):
         raise web.HTTPBadRequest(text=msg)
 
 
-async def _get_or_404(model, pk):
-    obj = await model.query.where(
-        model.id == int(pk)
-    ).gino.first()
+async def _version_etag_or_404(viewset, pk):
+    column = viewset.etag_column
+    backend = viewset.get_backend()
+    obj = await backend.get(pk, only=(column,), records=True)
     if obj is None:
-        raise web.HTTPNotFound(
-            text=f'{model.__qualname__} with pk {pk} does not exist.'
+        _raise_404(backend, pk)
+    return make_version_etag(pk, getattr(obj, column))
+
+
+async def _coalesce(viewset, request, func, *key):
+    """Await ``func()``, sharing its result with the concurrent requests
+    for the same route, match info and `key` if the ViewSet has
+    `single_flight` enabled.
+    """
+    flight = viewset._single_flight
+    if flight is None:
+        return await func()
+    match_info = request.match_info
+    try:
+        return await flight.do(
+            (match_info.route, tuple(sorted(match_info.items())), *key),
+            func
         )
-    return obj
+    except web.HTTPException as e:
+        # A raised HTTPException is also the response sent for it,
+        # which can't be shared between requests.
+        raise _copy_http_exception(e) from None
+
+
+def _copy_http_exception(e):
+    try:
+        return type(e)(headers=e.headers, reason=e.reason, body=e.body)
+    except TypeError:
+        # Exceptions with extra constructor arguments, e.g. redirects.
+        return e
+
+
+def _bind_filters(viewset, request):
+    filters = viewset._filters
+    if filters is None:
+        return None
+    return filters.bind(request.query)
+
+
+def _count(viewset, filters):
+    return viewset.get_backend().count(filters, mode=viewset.count_mode)
+
+
+def _parse_fields(viewset, request):
+    """Parse a sparse fieldset, i.e. `?fields=id,nickname`, into a tuple
+    of serializer field names in the serializer's order, or None if the
+    client didn't ask for one.
+
+    Clients name fields by their keys in the output, i.e. their
+    `data_key` if they have one.
+    """
+    raw = request.query.get('fields')
+    if raw is None:
+        return None
+    keys = {key.strip() for key in raw.split(',') if key.strip()}
+    names = {
+        field.data_key or name: name
+        for name, field in viewset.get_serializer().dump_fields.items()
+    }
+    unknown = keys.difference(names)
+    if unknown:
+        raise web.HTTPBadRequest(
+            text=f'Unknown fields: {", ".join(sorted(unknown))}.'
+        )
+    if not keys:
+        raise web.HTTPBadRequest(text='`fields` must not be empty.')
+    return tuple(name for key, name in names.items() if key in keys)
+
+
+def _only(fields):
+    return {} if fields is None else {'only': fields}
+
+
+def _read_attributes(viewset, fields):
+    """Get the names of the attributes backing `fields`, for backends to
+    only load those, or None if the client didn't ask for a fieldset.
+
+    Records are read with the attributes of every field.
+    """
+    serializer = viewset.get_serializer()
+    dump_fields = serializer.dump_fields
+    if fields is None:
+        if not viewset.use_records:
+            return None
+        fields = dump_fields
+    return tuple(dump_fields[name].attribute or name for name in fields)
+
+
+def _raise_404(backend, pk):
+    raise web.HTTPNotFound(
+        text=f'{backend.name} with pk {pk} does not exist.'
+    )
+
+
+async def _update(viewset, pk, values):
+    """Update the object with `pk`, either in a single round trip with
+    `use_returning` or through `get_object`.
+    """
+    backend = viewset.get_backend()
+    with _unique_violation_as_400(viewset):
+        if viewset.use_returning:
+            obj = await backend.update(pk, values)
+            if obj is None:
+                _raise_404(backend, pk)
+            return obj
+        obj = await viewset.get_object(pk)
+        return await backend.update_object(obj, values)
+
+
+async def _bulk_create(viewset, data):
+    """Validate and create every object in `data` in a single
+    transaction, reporting errors per item index.
+    """
+    _check_bulk_size(viewset, len(data))
+    if not data:
+        return viewset.json_response([], status=201)
+
+    try:
+        cleaned = viewset.get_serializer(many=True).load(data)
+    except ValidationError as ve:
+        return viewset.json_response({'errors': ve.messages}, status=400)
+
+    errors = await _validate_items(
+        viewset.get_serializer(), cleaned,
+        concurrency=viewset.bulk_validation_concurrency
+    )
+    if errors:
+        return viewset.json_response({'errors': errors}, status=400)
+
+    with _unique_violation_as_400(viewset):
+        created = await viewset.get_backend().bulk_create(cleaned)
+
+    return viewset.json_response(
+        viewset.get_dumper(many=True)(created),
+        status=201
+    )
+
+
+async def _validate_items(serializer, items, *, concurrency):
+    """Run `serializer.is_valid` on each item, at most `concurrency`
+    at a time, and return the error messages keyed by item index.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    errors = {}
+
+    async def validate(i, item):
+        async with semaphore:
+            try:
+                await serializer.is_valid(item, raise_exception=True)
+            except web.HTTPBadRequest as e:
+                errors[i] = e.text
+
+    await asyncio.gather(*(
+        validate(i, item) for i, item in enumerate(items)
+    ))
+    return dict(sorted(errors.items()))
+
+
+def _write_through(viewset, pk, obj):
+    """Respond with the object with `pk` that was just written,
+    refreshing its entry in the ViewSet's cache, and dropping the entry
+    of `pk` if the write changed the object's primary key.
+    """
+    body = viewset.get_codec().encode(viewset.get_dumper()(obj))
+    cache = viewset.cache
+    if cache is not None:
+        if obj.id != pk:
+            cache.invalidate(pk)
+        cache.set(obj.id, body)
+    return json_body_response(body)
+
+
+def _invalidate_cached(viewset, pks):
+    if viewset.cache is not None:
+        for pk in pks:
+            viewset.cache.invalidate(pk)
+
+
+def _check_bulk_size(viewset, size):
+    if size > viewset.max_bulk_size:
+        _raise_too_many(viewset)
+
+
+def _raise_too_many(viewset):
+    raise web.HTTPBadRequest(
+        text=f'Can not act on more than {viewset.max_bulk_size} '
+             'objects at once.'
+    )
+
+
+async def _delete_filtered(viewset, request):
+    """Delete the objects matching the filters of a request, which
+    must at least filter on one field. Deleting more than
+    `max_bulk_size` objects is rejected without deleting any.
+    """
+    filters = _bind_filters(viewset, request)
+    if filters is None or filters.whereclause is None:
+        raise web.HTTPBadRequest(text=_BULK_DELETE_USAGE)
+    deleted = await viewset.get_backend().delete_filtered(
+        filters, limit=viewset.max_bulk_size
+    )
+    if deleted is None:
+        _raise_too_many(viewset)
+    _invalidate_cached(viewset, deleted)
+    return web.json_response(status=204)
+
+
+def _parse_pk_list(backend, values):
+    """Parse primary keys given as comma separated lists."""
+    python_type = backend.pk_type
+    try:
+        return list(dict.fromkeys(
+            python_type(pk)
+            for value in values
+            for pk in value.split(',') if pk
+        ))
+    except ValueError:
+        raise web.HTTPBadRequest(
+            text=f'Invalid primary keys: {", ".join(values)}.'
+        ) from None
+
+
+def _load_bulk_partial(viewset, data):
+    """Deserialize a bulk partial update.
+
+    Each item must hold the primary key of the object it updates under
+    "id", as a JSON value of the primary key's type. Return the primary keys, the deserialized values and the
+    errors keyed by item index.
+    """
+    pk_type = viewset.get_backend().pk_type
+    pks, items, errors = [], [], {}
+    seen = set()
+    for i, item in enumerate(data):
+        try:
+            pk = load_pk(item['id'], pk_type)
+        except (TypeError, KeyError, ValueError, ArithmeticError):
+            errors[i] = {'id': ['Missing or invalid primary key.']}
+            pk = None
+        else:
+            if pk in seen:
+                errors[i] = {'id': ['Duplicate primary key.']}
+            seen.add(pk)
+        pks.append(pk)
+        if isinstance(item, dict):
+            item = {k: v for k, v in item.items() if k != 'id'}
+        items.append(item)
+
+    try:
+        cleaned = viewset.get_serializer(many=True, partial=True).load(items)
+    except ValidationError as ve:
+        for i, messages in ve.messages.items():
+            errors.setdefault(i, {}).update(messages)
+        cleaned = None
+    return pks, cleaned, dict(sorted(errors.items()))
+
+
+@contextlib.contextmanager
+def _unique_violation_as_400(viewset):
+    """Answer a violated unique constraint with a `web.HTTPBadRequest`.
+
+    The message is looked up by constraint name in the ViewSet's
+    `unique_violation_messages`.
+    """
+    try:
+        yield
+    except UniqueViolation as e:
+        msg = viewset.unique_violation_messages.get(e.constraint_name)
+        if msg is None:
+            msg = e.detail or f'Unique constraint "{e.constraint_name}" ' \
+                              'violated.'
+        raise web.HTTPBadRequest(text=msg) from None
+
+
+@contextlib.contextmanager
+def _objects_not_found_as_404(viewset):
+    try:
+        yield
+    except ObjectsNotFound as e:
+        _raise_404(viewset.get_backend(), ', '.join(map(str, e.pks)))
+
+
+async def _stream_ndjson(
+        request, backend, dump, codec, *,
+        chunk_size, filters=None, only=None, records=False
+):
+    """Stream every object as newline delimited JSON.
+
+    Objects are read from the backend `chunk_size` at a time, and the
+    next chunk is only fetched once the previous one has been written,
+    so a slow client applies backpressure to the backend, e.g. to a
+    server-side cursor.
+    """
+    resp = web.StreamResponse(headers={hdrs.CONTENT_TYPE: NDJSON})
+    resp.enable_chunked_encoding()
+    await resp.prepare(request)
+
+    chunks = backend.iterate(
+        chunk_size=chunk_size, filters=filters, only=only, records=records
+    )
+    try:
+        async for rows in chunks:
+            await resp.write(b''.join(
+                codec.encode(item) + b'\n'
+                for item in dump(rows)
+            ))
+    finally:
+        # Releases the backend's resources, e.g. its transaction, if
+        # the client went away.
+        await chunks.aclose()
+
+    await resp.write_eof()
+    return resp
 
 
 def _validate_or_raise(serializer, data):
@@ -0,0 +1,59 @@
+"""
+ViewSets backed by a gino model.
+
+Unlike `laviewset.views`, this module imports the CRUD mixins and, with
+them, marshmallow, sqlalchemy and asyncpg. It is loaded on first access
+of `laviewset.ModelViewSet` or `laviewset.ReadOnlyModelViewSet`.
+"""
+from .mixins import (
+    ListMixin,
+    RetrieveMixin,
+    DestroyMixin,
+    UpdateMixin,
+    PartialUpdateMixin,
+    CreateMixin,
+    BulkPartialUpdateMixin,
+    BulkDestroyMixin
+)
+from .views import GenericViewSet, _fake_route, empty
+
+__all__ = (
+    'ModelViewSet',
+    'ReadOnlyModelViewSet'
+)
+
+
+class ModelViewSet(
+    CreateMixin, RetrieveMixin, UpdateMixin,
+    PartialUpdateMixin, DestroyMixin, ListMixin,
+    BulkPartialUpdateMixin, BulkDestroyMixin,
+    GenericViewSet
+):
+    """
+    A viewset that provides default `create()`, `retrieve()`, `update()`,
+    `partial_update()`, `destroy()` and `list()` actions, along with
+    `bulk_partial_update()` and `bulk_delete()` on the collection.
+
+    A namesake of, and inspired from, django-rest-framework/ModelViewSet.
+    """
+
+    route = _fake_route
+    model = None
+
+
+class ReadOnlyModelViewSet(
+    RetrieveMixin, ListMixin,
+    GenericViewSet
+):
+    """
+    A viewset that provides default `list()` and `retrieve()` actions.
+
+    A namesake of, and inspired from, django-rest-framework/ReadOnly
+    ModelViewSet.
+    """
+
+    pass
+
+
+# See `laviewset.views`.
+ModelViewSet.route = empty
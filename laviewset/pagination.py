@@ -0,0 +1,125 @@
+"""
+Pagination helpers for list views.
+
+Pages are keyset (cursor) based by default: the client is handed an
+opaque ``after`` cursor through the ``Link`` response header and passes it
+back to fetch the next page. Offset based pagination is supported as a
+fallback through ``?offset=N``.
+"""
+import base64
+import binascii
+import json
+from typing import Any, Callable, Mapping, NamedTuple, Optional
+
+from aiohttp import web
+from yarl import URL
+
+from .backends import load_pk
+
+__all__ = (
+    'PageParams',
+    'encode_cursor',
+    'decode_cursor',
+    'get_page_params',
+    'next_page_link',
+)
+
+
+class PageParams(NamedTuple):
+
+    limit: Optional[int]    # None if the list should not be paginated
+    after: Optional[Any]    # decoded keyset cursor
+    offset: Optional[int]
+
+
+def encode_cursor(value: Any) -> str:
+    """Encode a JSON serializable keyset value into an opaque cursor."""
+    raw = json.dumps(value, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(
+        cursor: str,
+        pk_type: Optional[Callable[[Any], Any]] = None
+) -> Any:
+    """Decode a cursor created by `encode_cursor` or raise a
+    `web.HTTPBadRequest`.
+
+    If `pk_type` is given, the cursor must hold a primary key of that
+    type; see `laviewset.backends.load_pk`.
+    """
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        value = json.loads(base64.urlsafe_b64decode(padded))
+        if pk_type is not None:
+            value = load_pk(value, pk_type)
+    except (binascii.Error, ValueError, TypeError, ArithmeticError):
+        raise web.HTTPBadRequest(text=f'Invalid cursor {cursor!r}.') from None
+    return value
+
+
+def _non_negative_int(query: Mapping[str, str], name: str) -> Optional[int]:
+    if name not in query:
+        return None
+    try:
+        value = int(query[name])
+    except ValueError:
+        value = -1
+    if value < 0:
+        raise web.HTTPBadRequest(
+            text=f'"{name}" must be a non-negative integer.'
+        )
+    return value
+
+
+def get_page_params(
+        query: Mapping[str, str], *,
+        page_size: Optional[int],
+        max_page_size: Optional[int],
+        pk_type: Optional[Callable[[Any], Any]] = None
+) -> PageParams:
+    """Parse the pagination parameters of a request's query string.
+
+    `page_size` is used when the client does not ask for a `limit`; if it
+    is None and the client passes no pagination parameters, the list is
+    not paginated. A `limit` greater than `max_page_size` is clamped.
+    The ``after`` cursor is converted with `pk_type`, if given.
+    """
+    limit = _non_negative_int(query, 'limit')
+    offset = _non_negative_int(query, 'offset')
+    cursor = query.get('after')
+
+    if cursor is not None and offset is not None:
+        raise web.HTTPBadRequest(
+            text='"after" and "offset" can not be used together.'
+        )
+    if limit == 0:
+        raise web.HTTPBadRequest(text='"limit" must be greater than 0.')
+
+    if limit is None:
+        limit = page_size
+        if limit is None and (cursor is not None or offset is not None):
+            limit = max_page_size
+    if limit is not None and max_page_size is not None:
+        limit = min(limit, max_page_size)
+
+    after = decode_cursor(cursor, pk_type) if cursor is not None else None
+    return PageParams(limit, after, offset)
+
+
+def next_page_link(
+        url: URL, page: PageParams, *,
+        last: Any
+) -> str:
+    """Build a ``Link`` header value pointing to the page after `page`.
+
+    `last` is the keyset value of the last item on the current page and
+    is only used when the current page was not fetched by offset.
+    """
+    query = dict(url.query)
+    query['limit'] = str(page.limit)
+    if page.offset is not None:
+        query['offset'] = str(page.offset + page.limit)
+    else:
+        query['after'] = encode_cursor(last)
+    return f'<{url.with_query(query)}>; rel="next"'
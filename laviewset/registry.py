@@ -0,0 +1,105 @@
+"""
+Deferred registration of ViewSet routes.
+
+ViewSets whose base route is created without a router are not bound to
+any application: their routes are collected when the classes are defined
+and registered on one or more applications with `install`.
+
+    base_route = Route.create_base()
+    listings_route = base_route.extend('listings')
+
+    class ListingsModelViewSet(ModelViewSet):
+
+        route = listings_route
+        ...
+
+    app = web.Application()
+    laviewset.install(app)
+"""
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+from aiohttp import web
+
+__all__ = (
+    'RouteConflictError',
+    'install',
+    'register',
+    'registered',
+)
+
+_registry: Dict[Type, Tuple[web.RouteDef, ...]] = {}
+
+
+class RouteConflictError(ValueError):
+    """Exception class for routes registered twice by `install`."""
+
+
+def register(viewset: Type, routedefs: Iterable[web.RouteDef]) -> None:
+    """Collect the routes of a deferred ViewSet until it is installed."""
+    _registry[viewset] = tuple(routedefs)
+
+
+def registered() -> List[Type]:
+    """Get the deferred ViewSets, in order of definition."""
+    return list(_registry)
+
+
+def _is_dynamic(routedef: web.RouteDef) -> bool:
+    return '{' in routedef.path
+
+
+def _sorted(routedefs: List[web.RouteDef]) -> List[web.RouteDef]:
+    """Sort static routes before dynamic ones, keeping the routes of a
+    path together so they share a resource, and the definition order
+    otherwise.
+    """
+    first_seen: Dict[str, int] = {}
+    for i, routedef in enumerate(routedefs):
+        first_seen.setdefault(routedef.path, i)
+    return sorted(routedefs, key=lambda r: (
+        _is_dynamic(r), first_seen[r.path]
+    ))
+
+
+def _check_conflicts(routedefs: List[web.RouteDef]) -> None:
+    seen: Dict[Tuple[str, str], web.RouteDef] = {}
+    for routedef in routedefs:
+        key = (routedef.method, routedef.path)
+        if key in seen:
+            raise RouteConflictError(
+                f'{routedef.method} {routedef.path} is defined by both '
+                f'{seen[key].handler.__qualname__} and '
+                f'{routedef.handler.__qualname__}.'
+            )
+        seen[key] = routedef
+
+
+def install(
+        app: web.Application,
+        viewsets: Optional[Iterable[Type]] = None, *,
+        freeze: bool = True
+) -> None:
+    """Register the routes of deferred ViewSets on `app`'s router.
+
+    Every deferred ViewSet is installed unless `viewsets` are given.
+    Conflicting routes are reported before anything is registered, static
+    routes are registered before dynamic ones, and the router is frozen
+    afterwards unless `freeze` is False. The same ViewSets can be
+    installed on any number of applications.
+    """
+    if viewsets is None:
+        viewsets = registered()
+    routedefs = []
+    for viewset in viewsets:
+        try:
+            routedefs.extend(_registry[viewset])
+        except KeyError:
+            raise ValueError(
+                f'{viewset.__qualname__} is not a deferred ViewSet.'
+            ) from None
+
+    _check_conflicts(routedefs)
+    router = app.router
+    router.add_routes(_sorted(routedefs))
+    if freeze:
+        router.freeze()
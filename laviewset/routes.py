@@ -11,6 +11,7 @@ from typing import (
 import attr
 from aiohttp import web
 
+from .converters import expand_converters
 from .resources import Resource
 
 
@@ -33,6 +34,8 @@ class ViewAttrs(NamedTuple):
     path: str
     method: str
     routedef_kwargs: Dict[str, Any]  # kwargs to be passed to web.Routedef
+    # Conversion functions of typed path variables, e.g. `{pk:int}`.
+    converters: Dict[str, Callable[[str], Any]] = {}
 
 
 def _make_view(
@@ -52,7 +55,9 @@ class RouteError(Exception):
 @attr.s(auto_attribs=True)
 class Route:
 
-    router: web.UrlDispatcher
+    # None for routes whose ViewSets are installed with
+    # `laviewset.install`.
+    router: Optional[web.UrlDispatcher]
 
     name: Optional[str] = None
     is_base: bool = False
@@ -73,11 +78,17 @@ class Route:
         self._path = p
 
     @classmethod
-    def create_base(cls, router: web.UrlDispatcher, **kw) -> Route:
+    def create_base(
+            cls, router: Optional[web.UrlDispatcher] = None, **kw
+    ) -> Route:
         """Creates and returns a base Route.
 
         The `create_base` method should be preferred for project level
         initialization of the base Route over __init__.
+
+        If no `router` is given, the routes of the ViewSets using the
+        base Route, or its extensions, are registered by
+        `laviewset.install` instead of when the ViewSets are defined.
         """
         enforce = _pop(kw, 'enforce')
 
@@ -122,12 +133,13 @@ class Route:
         # Any kwargs that get through to here
         # will be considered kwargs for web.routedef.
         kwargs_for_routedef = kw
+        expanded, converters = expand_converters(str(path))
 
         def inner(handler: Callable[..., Any]) -> Callable[..., Any]:
-            return _make_view(
-                handler,
-                ViewAttrs(str(path), method, kwargs_for_routedef)
-            )
+            view_attrs = ViewAttrs(expanded, method, kwargs_for_routedef)
+            if converters:
+                view_attrs = view_attrs._replace(converters=converters)
+            return _make_view(handler, view_attrs)
 
         return inner
 
@@ -0,0 +1,135 @@
+"""
+Compiled dump functions for marshmallow schemas.
+
+`Schema.dump` walks the schema's fields and accessors for every object it
+serializes. `compile_dump` generates a function specialized for a single
+schema instance that reads the attributes of an object directly and only
+defers to marshmallow for values or fields it can't handle itself, e.g.
+``fields.Method`` or ``fields.Nested``, for missing attributes, and for
+mappings such as dicts.
+"""
+import keyword
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Tuple
+
+from marshmallow import Schema, fields, missing
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+
+__all__ = (
+    'compile_dump',
+)
+
+
+# Field types that can be compiled, and the type a value must have to be
+# passed through as is. Any other value is handed to the field's own
+# `_serialize`.
+_PASSTHROUGH_TYPES: Dict[type, type] = {
+    fields.Integer: int,
+    fields.Float: float,
+    fields.String: str,
+    fields.Boolean: bool,
+}
+
+
+def _is_compilable_attr(attr: str) -> bool:
+    return attr.isidentifier() and not keyword.iskeyword(attr)
+
+
+def _can_compile_schema(schema: Schema) -> bool:
+    return (
+        type(schema).get_attribute is Schema.get_attribute
+        and not schema._has_processors(PRE_DUMP)
+        and not schema._has_processors(POST_DUMP)
+    )
+
+
+def _compile_field(
+        i: int, name: str, field: fields.Field,
+        namespace: Dict[str, Any]
+) -> Tuple[List[str], List[str]]:
+    """Return the source lines that serialize `field` into `_ret`, and
+    those that only go through marshmallow.
+    """
+    attr = field.attribute if field.attribute is not None else name
+    key = field.data_key if field.data_key is not None else name
+    as_string = getattr(field, 'as_string', False)
+    # Marshmallow serializes the fields that can't be compiled, and
+    # missing attributes, which it leaves out or gives their default.
+    namespace[f'_s{i}'] = field.serialize
+    fallback = [
+        f'_v = _s{i}({name!r}, obj, accessor=_get_attribute)',
+        f'if _v is not _missing:',
+        f'    _ret[{key!r}] = _v',
+    ]
+    if not _is_compilable_attr(attr):
+        return fallback, fallback
+
+    if type(field) is fields.Raw:
+        return [
+            'try:',
+            f'    _ret[{key!r}] = obj.{attr}',
+            'except AttributeError:',
+            *('    ' + line for line in fallback),
+        ], fallback
+
+    if type(field) in _PASSTHROUGH_TYPES and not as_string:
+        namespace[f'_f{i}'] = field._serialize
+        namespace[f'_t{i}'] = _PASSTHROUGH_TYPES[type(field)]
+        return [
+            'try:',
+            f'    _v = obj.{attr}',
+            'except AttributeError:',
+            *('    ' + line for line in fallback),
+            'else:',
+            f'    if _v is not None and _v.__class__ is not _t{i}:',
+            f'        _v = _f{i}(_v, {attr!r}, obj)',
+            f'    _ret[{key!r}] = _v',
+        ], fallback
+
+    return fallback, fallback
+
+
+def compile_dump(schema: Schema) -> Callable[[Any], Any]:
+    """Compile a dump function for a schema instance.
+
+    The returned function is a replacement for ``schema.dump``. Values
+    are read through attribute access, except from mappings, which are
+    dumped the way ``schema.dump`` does. Objects that are not mappings
+    but support item access, e.g. records, are therefore read by
+    attribute rather than by key. If the schema can't be compiled, e.g.
+    because it defines dump processors or overrides `get_attribute`,
+    ``schema.dump`` is returned.
+    """
+    if not _can_compile_schema(schema):
+        return schema.dump
+
+    namespace: Dict[str, Any] = {
+        '_Mapping': Mapping,
+        '_missing': missing,
+        '_get_attribute': schema.get_attribute,
+    }
+    lines = [
+        'def _dump_one(obj):',
+        '    if isinstance(obj, _Mapping):',
+        '        return _dump_mapping(obj)',
+        '    _ret = {}',
+    ]
+    mapping_lines = ['def _dump_mapping(obj):', '    _ret = {}']
+    for i, (name, field) in enumerate(schema.dump_fields.items()):
+        compiled, fallback = _compile_field(i, name, field, namespace)
+        lines.extend('    ' + line for line in compiled)
+        mapping_lines.extend('    ' + line for line in fallback)
+    lines.append('    return _ret')
+    mapping_lines.append('    return _ret')
+
+    exec('\n'.join(mapping_lines), namespace)
+    exec('\n'.join(lines), namespace)
+    dump_one = namespace['_dump_one']
+
+    if not schema.many:
+        return dump_one
+
+    def dump_many(objs: Any) -> List[Any]:
+        return [dump_one(obj) for obj in objs]
+
+    return dump_many
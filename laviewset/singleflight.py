@@ -0,0 +1,55 @@
+"""
+Coalescing of concurrent identical calls.
+
+A `SingleFlight` runs at most one call per key at a time: callers that
+ask for a key while a call for it is in flight wait for that call's
+result instead of starting their own.
+
+    flight = SingleFlight()
+    body = await flight.do(('retrieve', pk), lambda: fetch_and_encode(pk))
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+__all__ = (
+    'SingleFlight',
+)
+
+_T = TypeVar('_T')
+
+
+class SingleFlight:
+    """Share the result of in-flight calls between concurrent callers.
+
+    The shared call runs in its own task, shielded from its callers: a
+    caller that is cancelled, e.g. because its client disconnected,
+    stops waiting without cancelling the call for the others. Results,
+    and exceptions, are shared as is, so they should not be mutated.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, 'asyncio.Future[_T]'] = {}
+
+    def __len__(self) -> int:
+        """Number of calls in flight."""
+        return len(self._calls)
+
+    async def do(
+            self, key: Hashable,
+            func: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Await ``func()``, or the in-flight call for `key` if any."""
+        fut = self._calls.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(func())
+            self._calls[key] = fut
+            fut.add_done_callback(lambda f: self._forget(key, f))
+        return await asyncio.shield(fut)
+
+    def _forget(self, key: Hashable, fut: 'asyncio.Future[_T]') -> None:
+        if self._calls.get(key) is fut:
+            del self._calls[key]
+        if not fut.cancelled():
+            # Mark the exception as retrieved in case every caller
+            # was cancelled before the call finished.
+            fut.exception()
@@ -0,0 +1,112 @@
+"""
+A cache of the compiled SQL of queries, by query shape.
+
+Building a SQLAlchemy query and compiling it to SQL costs more than
+running most of the queries the CRUD mixins make, such as a primary key
+lookup. Those queries only differ in the values of their parameters, so
+the `GinoBackend` compiles each of their shapes once, e.g. "the rows
+with `id = $1`, selecting `id` and `name`", and keeps the compiled
+statement in a `StatementCache`:
+
+    backend = ListingsModelViewSet.get_backend()
+    backend.statements.cache_info()
+    # StatementCacheInfo(hits=..., misses=..., maxsize=256, currsize=...,
+    #                    compile_time=...)
+
+Running the same SQL also lets asyncpg reuse the statement it prepared
+on each pooled connection, as long as its statement cache is enabled.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple, Optional
+
+__all__ = (
+    'StatementCache',
+    'StatementCacheInfo',
+)
+
+
+class StatementCacheInfo(NamedTuple):
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+    # Seconds spent building and compiling queries.
+    compile_time: float
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class StatementCache:
+    """A cache of compiled queries, keyed by shape.
+
+    Statements are compiled for a dialect and dropped when another one
+    is used, e.g. once the engine they were compiled for is replaced.
+    Beyond `maxsize` statements, which may be None, the least recently
+    used ones are evicted, so that shapes made of arbitrary combinations
+    of fields, e.g. by sparse fieldsets, don't push out the common ones.
+    """
+
+    def __init__(
+            self, maxsize: Optional[int] = 256, *,
+            timer: Callable[[], float] = time.perf_counter
+    ):
+        self.maxsize = maxsize
+        self._timer = timer
+        self._statements: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._dialect: Any = None
+        self.hits = 0
+        self.misses = 0
+        self.compile_time = 0.0
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._statements
+
+    def get(
+            self, key: Optional[Hashable], dialect: Any,
+            build: Callable[[], Any]
+    ) -> Any:
+        """Get the statement of `key` compiled for `dialect`, compiling
+        the query returned by `build` if it is missing.
+
+        The statement is neither looked up nor cached if `key` is None.
+        """
+        if dialect is not self._dialect:
+            self.clear()
+            self._dialect = dialect
+        if key is not None:
+            try:
+                statement = self._statements[key]
+            except KeyError:
+                pass
+            else:
+                self._statements.move_to_end(key)
+                self.hits += 1
+                return statement
+
+        self.misses += 1
+        start = self._timer()
+        statement = build().compile(dialect=dialect)
+        self.compile_time += self._timer() - start
+        if key is not None and self.maxsize != 0:
+            self._statements[key] = statement
+            if self.maxsize is not None and \
+                    len(self._statements) > self.maxsize:
+                self._statements.popitem(last=False)
+        return statement
+
+    def clear(self) -> None:
+        self._statements.clear()
+
+    def cache_info(self) -> StatementCacheInfo:
+        return StatementCacheInfo(
+            self.hits, self.misses, self.maxsize, len(self._statements),
+            self.compile_time
+        )
@@ -13,9 +13,12 @@ from typing import (
     cast,
     Mapping,
     NoReturn,
-    Generic
+    Generic,
+    Optional,
+    TYPE_CHECKING
 )
 from ._compat import Protocol
+import collections
 import functools
 import inspect
 import string
@@ -27,14 +30,17 @@ from .routes import (
     Route,
     is_view, get_view_attrs
 )
-from .mixins import (
-    ListMixin,
-    RetrieveMixin,
-    DestroyMixin,
-    UpdateMixin,
-    PartialUpdateMixin,
-    CreateMixin
-)
+from .cache import LRUCache
+from .codec import JsonCodec, get_json_codec
+from .registry import register
+from .singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    # Kept off the import path of ViewSets, which don't need
+    # sqlalchemy, gino or marshmallow.
+    from .backends import Backend
+    from .filters import Filters
+    from .loaders import PrimaryKeyLoader
 
 __all__ = (
     'ViewSet',
@@ -87,21 +93,17 @@ def _extract_views(d: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
             yield name, attr
 
 
-def _create_and_register_routedef(
-        handler: _ViewHandlerType,
-        router: web.UrlDispatcher
-) -> None:
-    """Create and register a web.RouteDef.
+def _create_routedef(handler: _ViewHandlerType) -> web.RouteDef:
+    """Create a web.RouteDef from the ViewAttrs of a handler.
     """
     attrs = get_view_attrs(handler)
 
-    routedef = web.route(
+    return web.route(
         attrs.method,
         attrs.path,
         cast(_SimpleHandler, handler),
         **attrs.routedef_kwargs     # kwargs belonging to web.Routedef;
     )                               # not to be mistaken with view's kwargs
-    routedef.register(router)
 
 
 def _check_for_arg_errors(
@@ -213,13 +215,27 @@ def _get_handler_from_view(view: _BoundViewHandler) -> _SimpleHandler:
     # We call _get_kwonly_or_raise here so that we can raise any errors
     # statically, i.e. during class definition build.
     kw_only_args = _get_kwonly_or_raise(view)
+    if not kw_only_args:
+        # The bound view already is a valid aiohttp handler.
+        return cast(_SimpleHandler, view)
+
+    converters = get_view_attrs(view).converters
+    extractors = tuple(
+        (name, converters.get(name)) for name in kw_only_args
+    )
 
     @functools.wraps(view)
     async def handler(request: web.Request) -> web.StreamResponse:
-        kwargs = {
-            name: request.match_info.get(name)
-            for name in kw_only_args
-        }
+        match_info = request.match_info
+        kwargs = {}
+        for name, convert in extractors:
+            value = match_info.get(name)
+            if convert is not None:
+                try:
+                    value = convert(value)
+                except ValueError:
+                    raise web.HTTPNotFound() from None
+            kwargs[name] = value
 
         return await view(request, **kwargs)
 
@@ -238,6 +254,15 @@ class ViewSignatureError(TypeError):
     """Exception class for view signatures."""
 
 
+# Constructor kwargs of the serializers used by the CRUD mixins.
+_EAGER_SERIALIZER_KWARGS: Tuple[Dict[str, Any], ...] = (
+    {}, {'many': True}, {'partial': True}
+)
+# Number of serializers and dumpers cached per ViewSet class, least
+# recently used first out. Sparse fieldsets make a shape per
+# combination of fields.
+_SERIALIZER_CACHE_SIZE = 128
+
 # `empty` allows asserting that the user has
 # provided a route attribute to any extended
 # ViewSet.
@@ -277,6 +302,46 @@ class _ViewSetMeta(Generic[_K], type):
 class GenericViewSet(metaclass=_ViewSetMeta):
 
     route = _fake_route
+    # Serializer instances are reused across requests, which is safe
+    # for stateless serializers such as marshmallow schemas. Set to
+    # False if the serializer keeps state between load/dump calls.
+    cache_serializers = True
+    # Compile specialized dump functions for the serializers returned
+    # by `get_dumper`. Fields that can't be compiled fall back to the
+    # serializer's own logic.
+    compile_serializers = False
+    # An `LRUCache` of encoded `retrieve` responses keyed by primary
+    # key. Writes made through the ViewSet refresh or invalidate it.
+    cache: Optional[LRUCache] = None
+    # The `Backend` the mixins read and write objects through. If None,
+    # ViewSets with a `model` use a `GinoBackend` of the model.
+    backend: Optional[Backend] = None
+    _backend: Optional[Backend] = None
+    # A `PrimaryKeyLoader` through which `get_object` batches the
+    # lookups of concurrent requests into a single query.
+    loader: Optional[PrimaryKeyLoader] = None
+    # Let concurrent `list` and `retrieve` requests for the same
+    # objects share a single fetch and encoded response.
+    single_flight = False
+    _single_flight: Optional[SingleFlight] = None
+    # Name of a model attribute, such as a version or `updated_at`
+    # column, that changes whenever a row does. If set, the ETags of
+    # `list` and `retrieve` are derived from it, so requests whose
+    # `If-None-Match` is still fresh skip the fetch and serialization.
+    etag_column: Optional[str] = None
+    # Messages of the 400 returned when a write violates a unique
+    # constraint, keyed by constraint name.
+    unique_violation_messages: Dict[str, str] = {}
+    _serializer_cache: 'collections.OrderedDict[Any, Any]' = \
+        collections.OrderedDict()
+    _dumper_cache: 'collections.OrderedDict[Any, Callable[[Any], Any]]' = \
+        collections.OrderedDict()
+    # A JsonCodec used for request and response bodies. If None,
+    # the codec set with `laviewset.set_json_codec` is used.
+    json_codec: Optional[JsonCodec] = None
+    # Compiled from the `filter_fields` and `ordering_fields` of
+    # list views.
+    _filters: Optional[Filters] = None
 
     def __init_subclass__(cls, **kwargs):
         route = cls.route
@@ -296,55 +361,214 @@ class GenericViewSet(metaclass=_ViewSetMeta):
             # subclasses of ViewSet.
             return
 
+        cls._backend = _make_backend(cls)
+        cls._filters = _compile_filters(cls)
+        _check_loader(cls)
+        if getattr(cls, 'count_mode', None) is not None:
+            _check_count_mode(cls.count_mode)
+
+        routedefs = []
         for name, attr in _extract_views(cls.__dict__):
             # We have to get the attribute from the class
             # to invoke __getattribute__.
             bound_view = getattr(cls(), name)
             _handler: _SimpleHandler = _get_handler_from_view(bound_view)
-
-            _create_and_register_routedef(
-                _handler,
-                cls.route.router
-            )
+            # The ViewAttrs of mixin views are overwritten by each
+            # subclass, so the routedef is created right away.
+            routedefs.append(_create_routedef(_handler))
+
+        if route.router is None:
+            # Deferred until `laviewset.install`.
+            register(cls, routedefs)
+        else:
+            for routedef in routedefs:
+                routedef.register(route.router)
+
+        cls._serializer_cache = collections.OrderedDict()
+        cls._dumper_cache = collections.OrderedDict()
+        cls._single_flight = SingleFlight() if cls.single_flight else None
+        if cls.cache_serializers and \
+                getattr(cls, 'serializer_class', None) is not None:
+            # Build the serializers used by the CRUD mixins eagerly,
+            # so the first requests don't pay for their construction.
+            for kw in _EAGER_SERIALIZER_KWARGS:
+                cls().get_dumper(**kw)
 
     def get_serializer(self, *args, **kwargs):
-        serializer_class = self.serializer_class
-        return serializer_class(*args, **kwargs)
+        """Get an instance of `serializer_class`.
 
+        Instances are cached per ViewSet class and constructor arguments
+        and shared by all requests, unless `cache_serializers` is False.
+        The least recently used ones are dropped beyond 128 of them.
+        """
+        serializer_class = self.serializer_class
+        if not self.cache_serializers:
+            return serializer_class(*args, **kwargs)
+
+        key = _serializer_key(serializer_class, args, kwargs)
+        try:
+            return _lru_get(self._serializer_cache, key)
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable constructor arguments can't be cached.
+            return serializer_class(*args, **kwargs)
+
+        serializer = serializer_class(*args, **kwargs)
+        _lru_set(self._serializer_cache, key, serializer)
+        return serializer
+
+    def get_dumper(self, *args, **kwargs) -> Callable[[Any], Any]:
+        """Get a function that serializes objects like
+        ``get_serializer(*args, **kwargs).dump``.
+
+        If `compile_serializers` is set, the function is compiled once
+        for the cached serializer instance and reads the attributes of
+        the objects it is given directly. Like serializers, only the
+        most recently used ones are kept.
+        """
+        if not (self.compile_serializers and self.cache_serializers):
+            return self.get_serializer(*args, **kwargs).dump
+
+        key = _serializer_key(self.serializer_class, args, kwargs)
+        try:
+            return _lru_get(self._dumper_cache, key)
+        except KeyError:
+            pass
+        except TypeError:
+            # Serializers of unhashable arguments aren't cached, so
+            # neither are their dumpers.
+            return self.get_serializer(*args, **kwargs).dump
+
+        # Imported here to keep marshmallow off the import path
+        # of ViewSets that don't serialize anything.
+        from .serializers import compile_dump
+        dump = compile_dump(self.get_serializer(*args, **kwargs))
+        _lru_set(self._dumper_cache, key, dump)
+        return dump
+
+    def get_backend(self) -> Optional[Backend]:
+        return self._backend
+
+    async def get_object(
+            self, pk: Any, *,
+            only: Optional[Tuple[str, ...]] = None,
+            records: bool = False
+    ) -> Any:
+        """Get the object with primary key `pk` from the ViewSet's
+        backend, or raise a `web.HTTPNotFound`. A `pk` given as a string,
+        as passed to views by untyped paths such as ``{pk}``, or as an
+        int is first converted to the primary key's type, which may
+        reject it, e.g. if it is out of the range of the column.
+
+        Lookups go through `loader`, if set, unless the names of the
+        attributes to load are given as `only`. If `records` is set, the
+        backend may return a read-only row holding those attributes
+        instead of an object.
+        """
+        backend = self._backend
+        try:
+            if isinstance(pk, (str, int)):
+                pk = backend.pk_type(pk)
+        except (ValueError, TypeError, ArithmeticError):
+            obj = None
+        else:
+            loader = self.loader
+            if loader is None or only is not None:
+                obj = await backend.get(pk, only=only, records=records)
+            else:
+                obj = await loader.load(pk)
+        if obj is None:
+            # Imported here to keep marshmallow off the import path
+            # of ViewSets without a model.
+            from .mixins import _raise_404
+            _raise_404(backend, pk)
+        return obj
+
+    def get_codec(self) -> JsonCodec:
+        codec = self.json_codec
+        return codec if codec is not None else get_json_codec()
+
+    def json_response(self, data: Any, **kwargs: Any) -> web.Response:
+        """Encode `data` with the ViewSet's codec into a response."""
+        return self.get_codec().response(data, **kwargs)
+
+    async def read_json(self, request: web.Request) -> Any:
+        """Decode the request's body with the ViewSet's codec."""
+        return await self.get_codec().read(request)
+
+
+def _make_backend(cls: Any) -> Optional[Backend]:
+    if cls.backend is not None:
+        return cls.backend
+    model = getattr(cls, 'model', None)
+    if model is None:
+        return None
+    from .gino_backend import GinoBackend
+    return GinoBackend(model)
+
+
+def _serializer_key(
+        serializer_class: Any, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+) -> Any:
+    return serializer_class, args, tuple(sorted(kwargs.items()))
+
+
+def _lru_get(cache: 'collections.OrderedDict[Any, Any]', key: Any) -> Any:
+    value = cache[key]
+    cache.move_to_end(key)
+    return value
+
+
+def _lru_set(
+        cache: 'collections.OrderedDict[Any, Any]', key: Any, value: Any
+) -> None:
+    cache[key] = value
+    if len(cache) > _SERIALIZER_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def _compile_filters(cls: Any) -> Optional[Filters]:
+    filter_fields = getattr(cls, 'filter_fields', ())
+    ordering_fields = getattr(cls, 'ordering_fields', ())
+    if not (filter_fields or ordering_fields):
+        return None
+    if not getattr(cls._backend, 'filterable', False):
+        raise ViewSetDefinitionError(
+            f'The backend of {cls.__qualname__} does not support '
+            '"filter_fields" or "ordering_fields".'
+        )
 
-class ViewSet(GenericViewSet):
+    from .filters import Filters
+    try:
+        return Filters(cls.model, filter_fields, ordering_fields)
+    except ValueError as e:
+        raise ViewSetDefinitionError(str(e)) from None
+
+
+def _check_loader(cls: Any) -> None:
+    # A PrimaryKeyLoader queries its model's table, which only makes
+    # sense for a backend reading that same model.
+    model = getattr(getattr(cls, 'loader', None), 'model', None)
+    if model is not None and \
+            getattr(cls._backend, 'model', None) is not model:
+        raise ViewSetDefinitionError(
+            f'The "loader" of {cls.__qualname__} does not load from '
+            'its backend.'
+        )
 
-    route = _fake_route
 
+def _check_count_mode(count_mode: Any) -> None:
+    from .counts import COUNT_MODES
+    if count_mode not in COUNT_MODES:
+        raise ViewSetDefinitionError(
+            f'"count_mode" must be one of {COUNT_MODES}.'
+        )
 
-class ModelViewSet(
-    CreateMixin, RetrieveMixin, UpdateMixin,
-    PartialUpdateMixin, DestroyMixin, ListMixin,
-    GenericViewSet
-):
-    """
-    A viewset that provides default `create()`, `retrieve()`, `update()`,
-    `partial_update()`, `destroy()` and `list()` actions.
 
-    A namesake of, and inspired from, django-rest-framework/ModelViewSet.
-    """
+class ViewSet(GenericViewSet):
 
     route = _fake_route
-    model = None
-
-
-class ReadOnlyModelViewSet(
-    RetrieveMixin, ListMixin,
-    GenericViewSet
-):
-    """
-    A viewset that provides default `list()` and `retrieve()` actions.
-
-    A namesake of, and inspired from, django-rest-framework/ReadOnly
-    ModelViewSet.
-    """
-
-    pass
 
 
 # Set routes to empty after the construction of any abstract
@@ -352,4 +576,12 @@ class ReadOnlyModelViewSet(
 # in the case that the user does not set a route attribute
 # on any concrete subclass of ViewSet.
 ViewSet.route = empty
-ModelViewSet.route = empty
+
+
+def __getattr__(name: str) -> Any:
+    # The model ViewSets are loaded on first access, so that importing
+    # ViewSet doesn't import the mixins and their dependencies.
+    if name in ('ModelViewSet', 'ReadOnlyModelViewSet'):
+        from . import model_views
+        return getattr(model_views, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -46,7 +46,7 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/Algebra8/LAViewSet",
-    packages=setuptools.find_packages(exclude=['tests*']),
+    packages=setuptools.find_packages(exclude=['tests*', 'benchmarks*']),
     classifiers=[
         "License :: OSI Approved :: MIT License",
         "Development Status :: 2 - Pre-Alpha",
@@ -57,5 +57,5 @@ setuptools.setup(
         "Intended Audience :: Developers",
     ],
     python_requires='>=3.7',
-    install_requires=["aiohttp", "marshmallow", "gino"]
+    install_requires=["aiohttp", "marshmallow", "gino", "asyncpg>=0.22"]
 )
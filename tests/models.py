@@ -23,7 +23,9 @@ class User(db.Model):
     __tablename__ = "test_users"
 
     id = db.Column(db.BigInteger(), primary_key=True)
-    nickname = db.Column("name", db.Unicode(), default=lambda: "test user")
+    nickname = db.Column(
+        "name", db.Unicode(), default=lambda: "test user", unique=True
+    )
 
 
 class UserSchema(Schema, SerializerMixin):
@@ -40,3 +42,10 @@ class UserSchema(Schema, SerializerMixin):
                 msg=f"User with nickname \"{cleaned_data['nickname']}\" "
                     f"already exists."
             )
+
+
+class UniqueUserSchema(Schema, SerializerMixin):
+    """Leaves checking that nicknames are unique to the database."""
+
+    id = fields.Int(required=True)
+    nickname = fields.Str(required=True)
@@ -0,0 +1,264 @@
+import json
+import types
+
+import pytest
+from aiohttp import web
+
+from laviewset import ModelViewSet, routes
+from laviewset.backends import MemoryBackend, ObjectsNotFound, UniqueViolation
+from laviewset.views import ViewSetDefinitionError
+from .models import UniqueUserSchema
+
+_USERS = [
+    {'id': 1, 'nickname': 'test1'},
+    {'id': 2, 'nickname': 'test2'},
+    {'id': 3, 'nickname': 'test3'},
+]
+
+
+@pytest.fixture
+def app():
+    return web.Application()
+
+
+@pytest.fixture
+def base_route(app):
+    return routes.Route.create_base(app.router)
+
+
+@pytest.fixture
+def memory_backend():
+    return MemoryBackend(objects=_USERS, name='User')
+
+
+@pytest.fixture
+def memory_viewset(base_route, memory_backend):
+
+    class MemoryViewSet(ModelViewSet):
+
+        route = base_route.extend('users')
+        serializer_class = UniqueUserSchema
+        backend = memory_backend
+        count_mode = 'exact'
+
+    return MemoryViewSet
+
+
+@pytest.fixture
+def cli(loop, aiohttp_client, app, memory_viewset):
+    return loop.run_until_complete(aiohttp_client(app))
+
+
+async def test_list(cli):
+    resp = await cli.get('/users')
+    assert resp.status == 200
+    assert await resp.json() == _USERS
+    assert resp.headers['X-Total-Count'] == '3'
+
+
+async def test_list_paginated(cli):
+    resp = await cli.get('/users', params={'limit': 2})
+    assert await resp.json() == _USERS[:2]
+
+    resp = await cli.get(resp.links['next']['url'].relative())
+    assert await resp.json() == _USERS[2:]
+    assert 'next' not in resp.links
+
+    resp = await cli.get('/users', params={'offset': 1, 'limit': 1})
+    assert await resp.json() == _USERS[1:2]
+
+
+@pytest.mark.parametrize('cursor', ['ImFiYyI', 'e30', 'MS41', 'dHJ1ZQ'])
+async def test_list_bad_cursor(cli, cursor):
+    resp = await cli.get('/users', params={'after': cursor})
+    assert resp.status == 400
+
+
+async def test_list_stream(cli, memory_viewset):
+    memory_viewset.stream_chunk_size = 2
+    resp = await cli.get(
+        '/users', headers={'Accept': 'application/x-ndjson'}
+    )
+    lines = (await resp.text()).splitlines()
+    assert [json.loads(line) for line in lines] == _USERS
+
+
+async def test_retrieve(cli):
+    resp = await cli.get('/users/1')
+    assert await resp.json() == _USERS[0]
+
+    resp = await cli.get('/users/1', params={'fields': 'nickname'})
+    assert await resp.json() == {'nickname': 'test1'}
+
+    resp = await cli.get('/users/99')
+    assert resp.status == 404
+    assert await resp.text() == 'User with pk 99 does not exist.'
+
+
+async def test_create(cli, memory_backend):
+    data = {'id': 4, 'nickname': 'new_user'}
+    resp = await cli.post('/users', data=json.dumps(data))
+    assert resp.status == 201
+    assert await resp.json() == data
+    assert resp.headers['Location'] == f'{resp.url}/4'
+    assert len(memory_backend) == 4
+
+    resp = await cli.post('/users', data=json.dumps(data))
+    assert resp.status == 400
+    assert len(memory_backend) == 4
+
+
+@pytest.mark.parametrize('use_returning', [False, True])
+async def test_update(cli, memory_viewset, use_returning):
+    memory_viewset.use_returning = use_returning
+
+    data = {'id': 1, 'nickname': 'updated'}
+    resp = await cli.put('/users/1', data=json.dumps(data))
+    assert await resp.json() == data
+
+    resp = await cli.patch('/users/2', data=json.dumps({'nickname': 'p'}))
+    assert await resp.json() == {'id': 2, 'nickname': 'p'}
+
+    resp = await cli.patch('/users/99', data=json.dumps({'nickname': 'p'}))
+    assert resp.status == 404
+
+
+@pytest.mark.parametrize('use_returning', [False, True])
+async def test_update_pk(cli, memory_viewset, memory_backend, use_returning):
+    memory_viewset.use_returning = use_returning
+
+    resp = await cli.patch('/users/3', data=json.dumps({'id': 30}))
+    assert await resp.json() == {'id': 30, 'nickname': 'test3'}
+    assert (await cli.get('/users/3')).status == 404
+    assert (await cli.get('/users/30')).status == 200
+
+    resp = await cli.patch('/users/30', data=json.dumps({'id': 1}))
+    assert resp.status == 400
+    assert (await cli.get('/users/30')).status == 200
+
+    resp = await cli.get('/users', params={'limit': 2, 'after': 'MQ'})
+    assert [u['id'] for u in await resp.json()] == [2, 30]
+    assert len(memory_backend) == 3
+
+
+@pytest.mark.parametrize('use_returning', [False, True])
+async def test_delete(cli, memory_viewset, memory_backend, use_returning):
+    memory_viewset.use_returning = use_returning
+
+    resp = await cli.delete('/users/1')
+    assert resp.status == 204
+    assert len(memory_backend) == 2
+
+    resp = await cli.delete('/users/1')
+    assert resp.status == 404
+
+
+async def test_bulk_create(cli, memory_backend):
+    data = [{'id': 5, 'nickname': 'bulk_5'}, {'id': 4, 'nickname': 'bulk_4'}]
+    resp = await cli.post('/users', data=json.dumps(data))
+    assert resp.status == 201
+    assert await resp.json() == data
+
+    resp = await cli.get('/users')
+    assert [u['id'] for u in await resp.json()] == [1, 2, 3, 4, 5]
+
+    data = [{'id': 6, 'nickname': 'bulk_6'}, {'id': 1, 'nickname': 'dup'}]
+    resp = await cli.post('/users', data=json.dumps(data))
+    assert resp.status == 400
+    assert len(memory_backend) == 5
+
+
+async def test_bulk_partial_update(cli):
+    data = [{'id': 1, 'nickname': 'a'}, {'id': 3, 'nickname': 'c'}]
+    resp = await cli.patch('/users', data=json.dumps(data))
+    assert await resp.json() == data
+
+    data = [{'id': 2, 'nickname': 'b'}, {'id': 99, 'nickname': 'x'}]
+    resp = await cli.patch('/users', data=json.dumps(data))
+    assert resp.status == 404
+    resp = await cli.get('/users/2')
+    assert (await resp.json())['nickname'] == 'test2'
+
+
+@pytest.mark.parametrize('pk', [1.9, True, '1', None])
+async def test_bulk_partial_update_bad_pk(cli, pk):
+    data = [{'id': pk, 'nickname': 'a'}]
+    resp = await cli.patch('/users', data=json.dumps(data))
+    assert resp.status == 400
+    assert await resp.json() == {
+        'errors': {'0': {'id': ['Missing or invalid primary key.']}}
+    }
+    resp = await cli.get('/users/1')
+    assert (await resp.json())['nickname'] == 'test1'
+
+
+async def test_bulk_delete(cli, memory_backend):
+    resp = await cli.delete('/users', params={'id': '1,99'})
+    assert resp.status == 404
+    assert len(memory_backend) == 3
+
+    resp = await cli.delete('/users', params={'id': '1,3'})
+    assert resp.status == 204
+    resp = await cli.get('/users')
+    assert await resp.json() == _USERS[1:2]
+
+
+async def test_memory_backend():
+    backend = MemoryBackend()
+    first = await backend.create({'nickname': 'a'})
+    second = await backend.create({'nickname': 'b'})
+    assert isinstance(first, types.SimpleNamespace)
+    assert (first.id, second.id) == (1, 2)
+    assert await backend.get(2) is second
+    assert await backend.count(mode='estimated') == 2
+
+    with pytest.raises(UniqueViolation):
+        await backend.create({'id': 1})
+    with pytest.raises(ObjectsNotFound) as exc_info:
+        await backend.bulk_delete([1, 3])
+    assert exc_info.value.pks == [3]
+    assert len(backend) == 2
+
+    chunks = [
+        [obj.id for obj in chunk]
+        async for chunk in backend.iterate(chunk_size=1)
+    ]
+    assert chunks == [[1], [2]]
+
+
+async def test_memory_backend_update_pks():
+    backend = MemoryBackend(objects=_USERS)
+    updated = await backend.bulk_update([1, 2], [{'id': 2}, {'id': 1}])
+    assert [updated[pk].id for pk in (1, 2)] == [2, 1]
+    assert (await backend.get(1)).nickname == 'test2'
+
+    with pytest.raises(UniqueViolation):
+        await backend.bulk_update([1, 3], [{'id': 4}, {'id': 4}])
+    with pytest.raises(UniqueViolation):
+        await backend.update(3, {'id': 1})
+    assert [(await backend.get(pk)).id for pk in (1, 2, 3)] == [1, 2, 3]
+
+
+def test_unfilterable_backend(base_route):
+    with pytest.raises(ViewSetDefinitionError):
+
+        class BadViewSet(ModelViewSet):
+
+            route = base_route.extend('bad')
+            serializer_class = UniqueUserSchema
+            backend = MemoryBackend()
+            filter_fields = ('nickname',)
+
+
+def test_loader_backend(base_route):
+    from laviewset import PrimaryKeyLoader
+    from .models import User
+
+    with pytest.raises(ViewSetDefinitionError):
+
+        class BadViewSet(ModelViewSet):
+
+            route = base_route.extend('bad')
+            serializer_class = UniqueUserSchema
+            backend = MemoryBackend()
+            loader = PrimaryKeyLoader(User)
@@ -0,0 +1,109 @@
+from laviewset import LRUCache
+
+
+class FakeTimer:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_set():
+    cache = LRUCache(2)
+
+    assert cache.get(1) is None
+    cache.set(1, b'one')
+    assert cache.get(1) == b'one'
+    assert 1 in cache and len(cache) == 1
+
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.currsize, info.currbytes) == \
+        (1, 1, 1, 3)
+
+
+def test_lru_eviction():
+    cache = LRUCache(2)
+    cache.set(1, b'one')
+    cache.set(2, b'two')
+    cache.get(1)
+    cache.set(3, b'three')
+
+    assert 2 not in cache
+    assert cache.get(1) == b'one'
+    assert cache.get(3) == b'three'
+    assert cache.evictions == 1
+
+
+def test_max_bytes():
+    cache = LRUCache(None, max_bytes=8)
+    cache.set(1, b'1234')
+    cache.set(2, b'5678')
+    cache.set(3, b'9')
+
+    assert 1 not in cache
+    assert cache.cache_info().currbytes == 5
+
+    # Values larger than the cache are not stored.
+    cache.set(2, b'123456789')
+    assert 2 not in cache
+    assert cache.cache_info().currbytes == 1
+
+
+def test_ttl():
+    timer = FakeTimer()
+    cache = LRUCache(ttl=10, timer=timer)
+    cache.set(1, b'one')
+
+    timer.now = 9
+    assert cache.get(1) == b'one'
+    timer.now = 10
+    assert cache.get(1) is None
+    assert 1 not in cache
+
+
+def test_invalidate_and_clear():
+    cache = LRUCache()
+    cache.set(1, b'one')
+    cache.set(2, b'two')
+
+    cache.invalidate(1)
+    cache.invalidate(99)
+    assert 1 not in cache and 2 in cache
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.cache_info().currbytes == 0
+
+
+def test_set_since():
+    cache = LRUCache(2)
+    since = cache.stamp()
+    cache.set(1, b'fresh')
+    cache.set(1, b'stale', since=since)
+    assert cache.get(1) == b'fresh'
+
+    since = cache.stamp()
+    cache.invalidate(2)
+    cache.set(2, b'stale', since=since)
+    assert 2 not in cache
+
+    since = cache.stamp()
+    cache.set(3, b'three', since=since)
+    assert cache.get(3) == b'three'
+
+
+def test_set_since_forgotten(monkeypatch):
+    monkeypatch.setattr('laviewset.cache._WRITE_LOG_SIZE', 2)
+    cache = LRUCache()
+    since = cache.stamp()
+    for key in range(3):
+        cache.invalidate(key)
+    # Whether 0 was written since is forgotten, so nothing is set.
+    cache.set(0, b'zero', since=since)
+    cache.set(9, b'nine', since=since)
+    assert 0 not in cache and 9 not in cache
+
+    cache.set(9, b'nine', since=cache.stamp())
+    assert 9 in cache
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+from aiohttp import web
+
+from laviewset import views, routes, HttpMethods, JsonCodec, set_json_codec
+from laviewset.codec import get_json_codec
+
+
+def _dumps_bytes(obj):
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+_BYTES_CODEC = JsonCodec(_dumps_bytes, json.loads)
+
+
+@pytest.fixture
+def app():
+    return web.Application()
+
+
+@pytest.fixture
+def base_route(app):
+    return routes.Route.create_base(app.router)
+
+
+@pytest.fixture
+def viewset_codec(base_route):
+
+    class CodecViewSet(views.ViewSet):
+
+        route = base_route.extend('codec')
+
+        @route('/', HttpMethods.POST)
+        async def echo(self, request):
+            data = await self.read_json(request)
+            return self.json_response(data, status=201)
+
+    return CodecViewSet
+
+
+@pytest.fixture
+def cli_codec(loop, aiohttp_client, app, viewset_codec):
+    return loop.run_until_complete(aiohttp_client(app))
+
+
+@pytest.fixture
+def default_codec():
+    codec = get_json_codec()
+    yield
+    set_json_codec(codec)
+
+
+def test_encode_str_and_bytes():
+    data = {'a': [1, 2]}
+    assert JsonCodec().encode(data) == json.dumps(data).encode()
+    assert _BYTES_CODEC.encode(data) == b'{"a":[1,2]}'
+
+
+def test_decode_malformed():
+    with pytest.raises(web.HTTPBadRequest):
+        JsonCodec().decode(b'{"a":')
+
+
+def test_set_json_codec_type(default_codec):
+    with pytest.raises(TypeError):
+        set_json_codec(_dumps_bytes)
+
+
+async def test_default_codec(cli_codec):
+    resp = await cli_codec.post('/codec', data=json.dumps({'a': 1}))
+
+    assert resp.status == 201
+    assert resp.content_type == 'application/json'
+    assert await resp.text() == '{"a": 1}'
+
+
+async def test_global_codec(cli_codec, default_codec):
+    set_json_codec(_BYTES_CODEC)
+
+    resp = await cli_codec.post('/codec', data=json.dumps({'a': 1}))
+    assert await resp.text() == '{"a":1}'
+
+
+async def test_viewset_codec(cli_codec, viewset_codec):
+    viewset_codec.json_codec = _BYTES_CODEC
+
+    resp = await cli_codec.post('/codec', data=json.dumps({'a': 1}))
+    assert await resp.text() == '{"a":1}'
+
+
+async def test_malformed_body(cli_codec):
+    resp = await cli_codec.post('/codec', data='{"a":')
+    assert resp.status == 400
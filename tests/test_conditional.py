@@ -0,0 +1,32 @@
+import pytest
+from aiohttp.test_utils import make_mocked_request
+
+from laviewset.conditional import etag_matches, make_etag
+
+
+def _request(if_none_match=None):
+    headers = {}
+    if if_none_match is not None:
+        headers['If-None-Match'] = if_none_match
+    return make_mocked_request('GET', '/', headers=headers)
+
+
+def test_make_etag():
+    etag = make_etag(b'body')
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag(b'body')
+    assert etag != make_etag(b'other body')
+
+
+@pytest.mark.parametrize('header, matches', [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ('*', True),
+    ('"xyz"', False),
+    ('abc', False),
+])
+def test_etag_matches(header, matches):
+    assert etag_matches(_request(header), '"abc"') is matches
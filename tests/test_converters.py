@@ -0,0 +1,37 @@
+import uuid
+
+import pytest
+
+from laviewset import routes
+from laviewset.converters import expand_converters, register_converter
+
+
+@pytest.mark.parametrize('path, expanded, converters', [
+    ('/listings', '/listings', {}),
+    (r'/{pk:\d+}', r'/{pk:\d+}', {}),
+    ('/{pk}', '/{pk}', {}),
+    ('/{pk:int}', r'/{pk:\d+}', {'pk': int}),
+    ('/{pk:int}/{name:str}', r'/{pk:\d+}/{name:[^{}/]+}',
+     {'pk': int, 'name': str}),
+    (r'/{pk:\d{3}}/{key:uuid}', None, {'key': uuid.UUID}),
+])
+def test_expand_converters(path, expanded, converters):
+    result, found = expand_converters(path)
+    if expanded is not None:
+        assert result == expanded
+    assert found == converters
+
+
+def test_register_converter():
+    register_converter('upper', '[A-Z]+', str.lower)
+    assert expand_converters('/{code:upper}') == (
+        '/{code:[A-Z]+}', {'code': str.lower}
+    )
+
+
+def test_route_converters():
+    base = routes.Route.create_base(object())
+    view = base('/{pk:int}', 'GET')(lambda: None)
+    view_attrs = routes.get_view_attrs(view)
+    assert view_attrs.path == r'/{pk:\d+}'
+    assert view_attrs.converters == {'pk': int}
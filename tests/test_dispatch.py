@@ -0,0 +1,98 @@
+import warnings
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+
+from laviewset import routes, views, HttpMethods
+from laviewset.dispatch import RadixUrlDispatcher
+
+
+def _text(text):
+    async def handler(request):
+        return web.Response(text=text)
+    return handler
+
+
+@pytest.fixture
+def app():
+    with warnings.catch_warnings():
+        # aiohttp deprecates passing a router to web.Application.
+        warnings.simplefilter('ignore', DeprecationWarning)
+        return web.Application(router=RadixUrlDispatcher())
+
+
+@pytest.fixture
+def cli(loop, aiohttp_client, app):
+    base_route = routes.Route.create_base(app.router)
+
+    class TestViewSet(views.ViewSet):
+
+        route = base_route.extend('tests')
+
+        @route('/', HttpMethods.GET)
+        async def list(self, request):
+            return web.Response(text='list')
+
+        @route(r'/{pk:\d+}', HttpMethods.GET)
+        async def retrieve(self, request, *, pk):
+            return web.Response(text=f'retrieve {pk}')
+
+        @route(r'/{pk:\d+}', HttpMethods.DELETE)
+        async def delete(self, request, *, pk):
+            return web.Response(text=f'delete {pk}')
+
+        @route('/{slug}', HttpMethods.GET)
+        async def by_slug(self, request, *, slug):
+            return web.Response(text=f'slug {slug}')
+
+        @route('/latest', HttpMethods.GET)
+        async def latest(self, request):
+            return web.Response(text='latest')
+
+    app.router.add_get('/files/{tail:.*}', _text('files'))
+    app.router.add_get('/', _text('root'))
+    return loop.run_until_complete(aiohttp_client(app))
+
+
+@pytest.mark.parametrize('method, path, status, text', [
+    ('GET', '/', 200, 'root'),
+    ('GET', '/tests', 200, 'list'),
+    ('GET', '/tests/1', 200, 'retrieve 1'),
+    ('DELETE', '/tests/12', 200, 'delete 12'),
+    # Falls through `{pk:\d+}` to the next dynamic resource.
+    ('GET', '/tests/abc', 200, 'slug abc'),
+    # Static segments take precedence over variables.
+    ('GET', '/tests/latest', 200, 'latest'),
+    ('GET', '/tests/caf%C3%A9', 200, 'slug café'),
+    # Not in the tree: variables spanning several segments.
+    ('GET', '/files/a/b.txt', 200, 'files'),
+    ('GET', '/nothing', 404, None),
+    ('GET', '/tests/1/2', 404, None),
+    ('POST', '/tests/1', 405, None),
+])
+async def test_resolve(cli, method, path, status, text):
+    resp = await cli.request(method, path)
+    assert resp.status == status
+    if text is not None:
+        assert await resp.text() == text
+
+
+async def test_resolve_through_tree(app, monkeypatch):
+    app.router.add_get('/tests', _text('list'))
+    app.router.add_get(r'/tests/{pk:\d+}', _text('retrieve'))
+    assert app.router._tree is None
+    app.router.freeze()
+
+    async def fallback(self, request):
+        raise AssertionError('resolved by the stock dispatcher')
+
+    monkeypatch.setattr(web.UrlDispatcher, 'resolve', fallback)
+    match_info = await app.router.resolve(
+        make_mocked_request('GET', '/tests/42')
+    )
+    assert match_info == {'pk': '42'}
+    match_info = await app.router.resolve(
+        make_mocked_request('GET', '/tests')
+    )
+    assert match_info.route.resource.canonical == '/tests'
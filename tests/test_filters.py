@@ -0,0 +1,72 @@
+import pytest
+import sqlalchemy as sa
+from aiohttp import web
+from multidict import MultiDict
+
+from laviewset.filters import Filters, NO_FILTERS, int_range
+from .models import User
+
+
+def test_bind_no_params():
+    filters = Filters(User, ('id',), ('nickname',))
+    assert filters.bind(MultiDict({'limit': '2'})) is NO_FILTERS
+
+
+def test_bind_coerces_values():
+    filters = Filters(User, ('id', 'nickname'))
+    bound = filters.bind(MultiDict({'id_gt': '1', 'nickname_in': 'a,b'}))
+    assert bound.params == {
+        'filter_id_gt': 1, 'filter_nickname_in': ['a', 'b']
+    }
+    assert not bound.ordered
+
+
+def test_bind_reuses_query_shape():
+    filters = Filters(User, ('id',), ('nickname',))
+    first = filters.bind(MultiDict({'id': '1', 'ordering': '-nickname'}))
+    second = filters.bind(MultiDict({'ordering': '-nickname', 'id': '2'}))
+    assert first.whereclause is second.whereclause
+    assert first.order_by is second.order_by
+    assert second.params == {'filter_id': 2}
+
+
+@pytest.mark.parametrize('params', [
+    {'nickname': 'test1'},
+    {'id_lt': '2'},
+    {'id': 'a'},
+    {'ordering': 'id'},
+])
+def test_bind_rejects(params):
+    filters = Filters(User, {'id': ['exact']}, ('nickname',))
+    with pytest.raises(web.HTTPBadRequest):
+        filters.bind(MultiDict(params))
+
+
+@pytest.mark.parametrize('params', [
+    {'id': str(2 ** 63)},
+    {'id_in': f'1,{-2 ** 63 - 1}'},
+    {'nickname': 'a\x00'},
+])
+def test_bind_rejects_values_out_of_range(params):
+    filters = Filters(User, ('id', 'nickname'))
+    with pytest.raises(web.HTTPBadRequest):
+        filters.bind(MultiDict(params))
+
+
+def test_bind_int_bounds():
+    filters = Filters(User, ('id',))
+    bound = filters.bind(MultiDict({'id_in': f'{2 ** 63 - 1},{-2 ** 63}'}))
+    assert bound.params == {'filter_id_in': [2 ** 63 - 1, -2 ** 63]}
+
+
+def test_int_range():
+    assert int_range(sa.SmallInteger()) == range(-2 ** 15, 2 ** 15)
+    assert int_range(sa.Integer()) == range(-2 ** 31, 2 ** 31)
+    assert int_range(sa.BigInteger()) == range(-2 ** 63, 2 ** 63)
+    assert int_range(sa.Numeric()) is None
+
+
+@pytest.mark.parametrize('filter_fields', [('password',), {'id': ['like']}])
+def test_bad_whitelist(filter_fields):
+    with pytest.raises(ValueError):
+        Filters(User, filter_fields)
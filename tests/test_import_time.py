@@ -0,0 +1,75 @@
+import subprocess
+import sys
+
+import pytest
+
+import laviewset
+from laviewset import model_views, views
+
+# Dependencies of the model ViewSets only.
+_HEAVY_MODULES = (
+    'asyncpg',
+    'gino',
+    'marshmallow',
+    'sqlalchemy',
+    'laviewset.mixins',
+    'laviewset.model_views',
+)
+
+
+def _imported_modules(code):
+    """Get the modules imported by running `code`, as reported by
+    ``python -X importtime``.
+    """
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        stderr=subprocess.PIPE, universal_newlines=True, check=True
+    )
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or line.endswith('package'):
+            continue
+        modules.add(line.rsplit('|', 1)[1].strip())
+    return modules
+
+
+def _heavy(modules):
+    return {
+        module for module in modules
+        if module.split('.')[0] in _HEAVY_MODULES or module in _HEAVY_MODULES
+    }
+
+
+@pytest.mark.parametrize('code', [
+    'import laviewset',
+    'from laviewset import Route, ViewSet, HttpMethods, install',
+])
+def test_viewset_import_path(code):
+    modules = _imported_modules(code)
+    assert 'laviewset.views' in modules
+    assert not _heavy(modules)
+
+
+def test_model_viewset_import_path():
+    modules = _imported_modules('from laviewset import ModelViewSet')
+    assert {'laviewset.mixins', 'marshmallow'} <= modules
+    # The Gino backend is only loaded by ViewSets with a model.
+    assert 'sqlalchemy' not in modules
+    assert 'laviewset.gino_backend' not in modules
+
+
+@pytest.mark.parametrize('name', [
+    'ModelViewSet',
+    'ReadOnlyModelViewSet',
+])
+def test_lazy_model_viewsets(name):
+    assert getattr(laviewset, name) is getattr(model_views, name)
+    assert getattr(views, name) is getattr(model_views, name)
+    assert name in dir(laviewset)
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        laviewset.NoSuchViewSet
+    with pytest.raises(AttributeError):
+        views.NoSuchViewSet
@@ -1,9 +1,13 @@
+import asyncio
 import json
 
 import pytest
+from marshmallow import fields
 
-from laviewset import ModelViewSet
-from .models import User, UserSchema
+from laviewset import ModelViewSet, LRUCache, PrimaryKeyLoader
+from laviewset.conditional import make_version_etag
+from laviewset.views import ViewSetDefinitionError
+from .models import User, UserSchema, UniqueUserSchema
 
 _serializer_class = UserSchema
 
@@ -46,6 +50,25 @@ async def test_retrieve_404(db_cli_core):
     assert resp.status == 404
 
 
+@pytest.mark.parametrize('use_returning', [False, True])
+async def test_pk_out_of_range(db_cli_core, model_viewset_core,
+                               use_returning):
+    model_viewset_core.use_returning = use_returning
+    model_viewset_core.loader = PrimaryKeyLoader(User)
+    url = f'/users/{2 ** 63}'
+
+    resp = await db_cli_core.get(url)
+    assert resp.status == 404
+    resp = await db_cli_core.patch(url, data=json.dumps({'nickname': 'x'}))
+    assert resp.status == 404
+    resp = await db_cli_core.delete(url)
+    assert resp.status == 404
+
+    model_viewset_core.etag_column = 'nickname'
+    resp = await db_cli_core.get(url)
+    assert resp.status == 404
+
+
 async def test_create(db_cli_core):
     data = {'id': 4, 'nickname': 'new_user'}
     resp = await db_cli_core.post('/users', data=json.dumps(data))
@@ -95,3 +118,940 @@ async def test_update(db_cli_core):
     put = await put_attempt.json()
     assert put['id'] == full_data['id']
     assert put['nickname'] == full_data['nickname']
+
+
+async def test_list_paginated(db_cli_core, get_all_users):
+    resp = await db_cli_core.get('/users', params={'limit': 2})
+    assert resp.status == 200
+
+    dat = await resp.json()
+    assert dat == _serializer_class(many=True).dump(get_all_users[:2])
+    assert resp.links['next']['url'].query['limit'] == '2'
+
+    next_resp = await db_cli_core.get(
+        resp.links['next']['url'].relative()
+    )
+    assert next_resp.status == 200
+
+    next_dat = await next_resp.json()
+    assert next_dat == _serializer_class(many=True).dump(get_all_users[2:])
+    assert 'next' not in next_resp.links
+
+
+async def test_list_offset(db_cli_core, get_all_users):
+    resp = await db_cli_core.get('/users', params={'offset': 1, 'limit': 1})
+    assert resp.status == 200
+
+    dat = await resp.json()
+    assert dat == _serializer_class(many=True).dump(get_all_users[1:2])
+    assert resp.links['next']['url'].query['offset'] == '2'
+
+
+async def test_list_max_page_size(db_cli_core, model_viewset_core):
+    model_viewset_core.max_page_size = 1
+
+    resp = await db_cli_core.get('/users', params={'limit': 100})
+    assert resp.status == 200
+    assert len(await resp.json()) == 1
+
+
+@pytest.mark.parametrize('params', [
+    {'limit': 'abc'},
+    {'limit': 0},
+    {'offset': -1},
+    {'after': '!!'},
+    # `"abc"`, `{}`, `1.5`, `true` and `"3"`.
+    {'after': 'ImFiYyI'},
+    {'after': 'e30'},
+    {'after': 'MS41'},
+    {'after': 'dHJ1ZQ'},
+    {'after': 'IjMi'},
+    {'after': 'MQ', 'offset': 1},
+])
+async def test_list_bad_page_params(db_cli_core, params):
+    resp = await db_cli_core.get('/users', params=params)
+    assert resp.status == 400
+
+
+async def test_list_stream(db_cli_core, get_all_users):
+    resp = await db_cli_core.get(
+        '/users', headers={'Accept': 'application/x-ndjson'}
+    )
+    assert resp.status == 200
+    assert resp.headers['Content-Type'] == 'application/x-ndjson'
+
+    lines = (await resp.text()).splitlines()
+    assert [json.loads(line) for line in lines] == \
+        _serializer_class(many=True).dump(get_all_users)
+
+
+async def test_list_stream_chunks(db_cli_core, model_viewset_core,
+                                  get_all_users):
+    model_viewset_core.stream = True
+    model_viewset_core.stream_chunk_size = 2
+
+    resp = await db_cli_core.get('/users')
+    assert resp.status == 200
+
+    lines = (await resp.text()).splitlines()
+    assert [json.loads(line) for line in lines] == \
+        _serializer_class(many=True).dump(get_all_users)
+
+
+def test_serializers_built_eagerly(model_viewset_core):
+    viewset = model_viewset_core()
+    cached = list(viewset._serializer_cache.values())
+
+    assert len(cached) == 3
+    assert viewset.get_serializer() in cached
+    assert viewset.get_serializer(many=True) in cached
+    assert viewset.get_serializer(partial=True) in cached
+
+
+def test_serializer_reused(model_viewset_core):
+    viewset = model_viewset_core()
+
+    assert viewset.get_serializer() is viewset.get_serializer()
+    assert viewset.get_serializer(many=True) is not viewset.get_serializer()
+    # Unhashable arguments can't be cached.
+    assert viewset.get_serializer(only=['id']) is not \
+        viewset.get_serializer(only=['id'])
+
+
+def test_serializer_cache_opt_out(db_router):
+
+    class UncachedViewSet(ModelViewSet):
+
+        route = db_router.extend('uncached')
+        model = User
+        serializer_class = _serializer_class
+        cache_serializers = False
+
+    viewset = UncachedViewSet()
+    assert not viewset._serializer_cache
+    assert viewset.get_serializer() is not viewset.get_serializer()
+
+
+async def test_compiled_serializers(db_cli_core, model_viewset_core,
+                                    get_all_users, get_user_1):
+    model_viewset_core.compile_serializers = True
+    viewset = model_viewset_core()
+    assert viewset.get_dumper() is viewset.get_dumper()
+    assert viewset.get_dumper() != viewset.get_serializer().dump
+
+    resp = await db_cli_core.get('/users')
+    assert await resp.json() == \
+        _serializer_class(many=True).dump(get_all_users)
+
+    resp = await db_cli_core.get('/users/1')
+    assert await resp.json() == _serializer_class().dump(get_user_1)
+
+
+def test_serializer_cache_lru(model_viewset_core, monkeypatch):
+    from laviewset import serializers, views
+
+    monkeypatch.setattr(views, '_SERIALIZER_CACHE_SIZE', 4)
+    compiled = []
+
+    def compile_dump(serializer):
+        compiled.append(serializer)
+        return serializer.dump
+
+    monkeypatch.setattr(serializers, 'compile_dump', compile_dump)
+    model_viewset_core.compile_serializers = True
+    viewset = model_viewset_core()
+
+    dumper = viewset.get_dumper(only=('id',))
+    for only in [('nickname',), ('id', 'nickname')] * 10:
+        viewset.get_dumper(only=only)
+        # Recently used entries are kept, whatever the other shapes.
+        assert viewset.get_dumper(only=('id',)) is dumper
+    assert len(compiled) == 3
+    assert len(viewset._serializer_cache) == 4
+
+    viewset.get_dumper()
+    viewset.get_dumper(many=True)
+    assert len(compiled) == 5
+    assert len(viewset._dumper_cache) == 4
+    # The least recently used shape was dropped, so it is compiled again.
+    viewset.get_dumper(only=('nickname',))
+    assert len(compiled) == 6
+
+
+async def test_update_returning(db_cli_core, model_viewset_core):
+    model_viewset_core.use_returning = True
+
+    full_data = {'id': 1, 'nickname': 'put_nickname'}
+    resp = await db_cli_core.put('/users/1', data=json.dumps(full_data))
+    assert resp.status == 200
+    assert await resp.json() == full_data
+
+    partial_data = {'nickname': 'patched_nickname'}
+    resp = await db_cli_core.patch('/users/1', data=json.dumps(partial_data))
+    assert resp.status == 200
+    assert await resp.json() == {'id': 1, 'nickname': 'patched_nickname'}
+
+    get_resp = await db_cli_core.get('/users/1')
+    assert await get_resp.json() == {'id': 1, 'nickname': 'patched_nickname'}
+
+
+async def test_update_returning_404(db_cli_core, model_viewset_core):
+    model_viewset_core.use_returning = True
+
+    resp = await db_cli_core.patch(
+        '/users/99', data=json.dumps({'nickname': 'nobody'})
+    )
+    assert resp.status == 404
+    assert await resp.text() == 'User with pk 99 does not exist.'
+
+    resp = await db_cli_core.patch('/users/99', data=json.dumps({}))
+    assert resp.status == 404
+
+
+async def test_delete_returning(db_cli_core, model_viewset_core):
+    model_viewset_core.use_returning = True
+
+    resp = await db_cli_core.delete('/users/1')
+    assert resp.status == 204
+
+    resp = await db_cli_core.delete('/users/1')
+    assert resp.status == 404
+    assert await resp.text() == 'User with pk 1 does not exist.'
+
+
+async def test_bulk_create(db_cli_core):
+    data = [
+        {'id': 4, 'nickname': 'bulk_4'},
+        {'id': 5, 'nickname': 'bulk_5'},
+    ]
+    resp = await db_cli_core.post('/users', data=json.dumps(data))
+    assert resp.status == 201
+    assert await resp.json() == data
+
+    list_resp = await db_cli_core.get('/users')
+    assert len(await list_resp.json()) == 5
+
+
+async def test_bulk_create_errors(db_cli_core):
+    data = [
+        {'id': 4, 'nickname': 'bulk_4'},
+        {'id': 'abc', 'nickname': 'bulk_5'},
+    ]
+    resp = await db_cli_core.post('/users', data=json.dumps(data))
+    assert resp.status == 400
+    assert list((await resp.json())['errors']) == ['1']
+
+    # `UserSchema.is_valid` rejects existing nicknames.
+    data = [
+        {'id': 4, 'nickname': 'test1'},
+        {'id': 5, 'nickname': 'bulk_5'},
+        {'id': 6, 'nickname': 'test3'},
+    ]
+    resp = await db_cli_core.post('/users', data=json.dumps(data))
+    assert resp.status == 400
+    assert list((await resp.json())['errors']) == ['0', '2']
+
+    list_resp = await db_cli_core.get('/users')
+    assert len(await list_resp.json()) == 3
+
+
+async def test_bulk_create_max_size(db_cli_core, model_viewset_core):
+    model_viewset_core.max_bulk_size = 1
+
+    data = [
+        {'id': 4, 'nickname': 'bulk_4'},
+        {'id': 5, 'nickname': 'bulk_5'},
+    ]
+    resp = await db_cli_core.post('/users', data=json.dumps(data))
+    assert resp.status == 400
+
+
+async def test_bulk_partial_update(db_cli_core):
+    data = [
+        {'id': 3, 'nickname': 'bulk_3'},
+        {'id': 1, 'nickname': 'bulk_1'},
+        {'id': 2},
+    ]
+    resp = await db_cli_core.patch('/users', data=json.dumps(data))
+    assert resp.status == 200
+    assert await resp.json() == [
+        {'id': 3, 'nickname': 'bulk_3'},
+        {'id': 1, 'nickname': 'bulk_1'},
+        {'id': 2, 'nickname': 'test2'},
+    ]
+
+    list_resp = await db_cli_core.get('/users')
+    assert [u['nickname'] for u in await list_resp.json()] == \
+        ['bulk_1', 'test2', 'bulk_3']
+
+
+async def test_bulk_partial_update_errors(db_cli_core):
+    data = [
+        {'id': 1, 'nickname': 'bulk_1'},
+        {'nickname': 'no_id'},
+        {'id': 1, 'nickname': 'duplicate'},
+        {'id': 3, 'nickname': 10},
+    ]
+    resp = await db_cli_core.patch('/users', data=json.dumps(data))
+    assert resp.status == 400
+    assert list((await resp.json())['errors']) == ['1', '2', '3']
+
+
+async def test_bulk_partial_update_404(db_cli_core, get_all_users):
+    data = [
+        {'id': 1, 'nickname': 'bulk_1'},
+        {'id': 99, 'nickname': 'bulk_99'},
+    ]
+    resp = await db_cli_core.patch('/users', data=json.dumps(data))
+    assert resp.status == 404
+
+    # Nothing was updated.
+    list_resp = await db_cli_core.get('/users')
+    assert await list_resp.json() == \
+        _serializer_class(many=True).dump(get_all_users)
+
+
+async def test_bulk_delete(db_cli_core):
+    resp = await db_cli_core.delete('/users', params={'id': '1,3'})
+    assert resp.status == 204
+
+    list_resp = await db_cli_core.get('/users')
+    assert [u['id'] for u in await list_resp.json()] == [2]
+
+
+async def test_bulk_delete_404(db_cli_core):
+    resp = await db_cli_core.delete('/users', params={'id': '1,99'})
+    assert resp.status == 404
+
+    list_resp = await db_cli_core.get('/users')
+    assert len(await list_resp.json()) == 3
+
+
+@pytest.mark.parametrize('params', [
+    {}, {'id': 'a,b'}, {'nickname': 'test1'}, {'id': str(2 ** 63)}
+])
+async def test_bulk_delete_bad_ids(db_cli_core, params):
+    resp = await db_cli_core.delete('/users', params=params)
+    assert resp.status == 400
+
+
+async def test_create_unique_violation(db_cli_core, model_viewset_core):
+    model_viewset_core.serializer_class = UniqueUserSchema
+
+    data = {'id': 4, 'nickname': 'test1'}
+    resp = await db_cli_core.post('/users', data=json.dumps(data))
+    assert resp.status == 400
+    assert await resp.text() == 'Key (name)=(test1) already exists.'
+
+    model_viewset_core.unique_violation_messages = {
+        'test_users_name_key': 'Nickname is taken.'
+    }
+    resp = await db_cli_core.post('/users', data=json.dumps(data))
+    assert resp.status == 400
+    assert await resp.text() == 'Nickname is taken.'
+
+    resp = await db_cli_core.patch('/users/2', data=json.dumps(data))
+    assert resp.status == 400
+    assert await resp.text() == 'Nickname is taken.'
+
+    resp = await db_cli_core.post('/users', data=json.dumps([data]))
+    assert resp.status == 400
+    assert await resp.text() == 'Nickname is taken.'
+
+
+async def test_create_returns_row(db_cli_core, model_viewset_core):
+    model_viewset_core.serializer_class = UniqueUserSchema
+
+    data = {'id': 4, 'nickname': 'new_user', 'extra': 1}
+    resp = await db_cli_core.post('/users', data=json.dumps(data))
+    assert resp.status == 400
+
+    del data['extra']
+    resp = await db_cli_core.post('/users', data=json.dumps(data))
+    assert resp.status == 201
+    assert await resp.json() == data
+
+
+async def test_retrieve_cache(db_cli_core, model_viewset_core):
+    cache = model_viewset_core.cache = LRUCache()
+
+    for _ in range(2):
+        resp = await db_cli_core.get('/users/1')
+        assert await resp.json() == {'id': 1, 'nickname': 'test1'}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Writes refresh the cached response...
+    data = {'nickname': 'patched_nickname'}
+    await db_cli_core.patch('/users/1', data=json.dumps(data))
+    resp = await db_cli_core.get('/users/1')
+    assert await resp.json() == {'id': 1, 'nickname': 'patched_nickname'}
+    assert cache.hits == 2
+
+    # ...and deletes drop it.
+    await db_cli_core.delete('/users/1')
+    resp = await db_cli_core.get('/users/1')
+    assert resp.status == 404
+    assert 1 not in cache
+
+
+async def test_retrieve_cache_pk_change(db_cli_core, model_viewset_core):
+    cache = model_viewset_core.cache = LRUCache()
+    await db_cli_core.get('/users/3')
+    assert 3 in cache
+
+    data = {'id': 30, 'nickname': 'test3'}
+    resp = await db_cli_core.put('/users/3', data=json.dumps(data))
+    assert resp.status == 200
+    assert 3 not in cache and 30 in cache
+    resp = await db_cli_core.get('/users/3')
+    assert resp.status == 404
+
+
+async def test_retrieve_cache_concurrent_write(db_cli_core,
+                                              model_viewset_core,
+                                              monkeypatch):
+    cache = model_viewset_core.cache = LRUCache()
+    backend = model_viewset_core().get_backend()
+    get = backend.get
+
+    async def slow_get(pk, **kwargs):
+        obj = await get(pk, **kwargs)
+        # The write lands while the stale object is being rendered.
+        monkeypatch.undo()
+        await db_cli_core.patch('/users/1', data=json.dumps({
+            'nickname': 'patched_nickname'
+        }))
+        return obj
+
+    monkeypatch.setattr(backend, 'get', slow_get)
+    resp = await db_cli_core.get('/users/1')
+    assert (await resp.json())['nickname'] == 'test1'
+
+    resp = await db_cli_core.get('/users/1')
+    assert (await resp.json())['nickname'] == 'patched_nickname'
+    assert cache.hits == 1
+
+
+async def test_retrieve_cache_bulk_writes(db_cli_core, model_viewset_core):
+    cache = model_viewset_core.cache = LRUCache()
+    await db_cli_core.get('/users/1')
+    await db_cli_core.get('/users/2')
+    assert len(cache) == 2
+
+    data = [{'id': 1, 'nickname': 'bulk_1'}]
+    await db_cli_core.patch('/users', data=json.dumps(data))
+    assert 1 not in cache
+
+    await db_cli_core.delete('/users', params={'id': '2'})
+    assert 2 not in cache
+
+
+async def test_retrieve_etag(db_cli_core):
+    resp = await db_cli_core.get('/users/1')
+    etag = resp.headers['ETag']
+
+    resp = await db_cli_core.get('/users/1', headers={'If-None-Match': etag})
+    assert resp.status == 304
+    assert resp.headers['ETag'] == etag
+
+    data = {'nickname': 'patched_nickname'}
+    await db_cli_core.patch('/users/1', data=json.dumps(data))
+    resp = await db_cli_core.get('/users/1', headers={'If-None-Match': etag})
+    assert resp.status == 200
+    assert resp.headers['ETag'] != etag
+
+
+async def test_list_etag(db_cli_core):
+    resp = await db_cli_core.get('/users')
+    etag = resp.headers['ETag']
+
+    resp = await db_cli_core.get('/users', headers={'If-None-Match': etag})
+    assert resp.status == 304
+
+    await db_cli_core.delete('/users/3')
+    resp = await db_cli_core.get('/users', headers={'If-None-Match': etag})
+    assert resp.status == 200
+
+
+async def test_version_etag(db_cli_core, model_viewset_core):
+    # Any column that changes along with the row will do.
+    model_viewset_core.etag_column = 'nickname'
+
+    resp = await db_cli_core.get('/users/1')
+    etag = resp.headers['ETag']
+    assert etag == make_version_etag(1, 'test1')
+
+    resp = await db_cli_core.get('/users/1', headers={'If-None-Match': etag})
+    assert resp.status == 304
+
+    resp = await db_cli_core.get('/users', params={'limit': 2})
+    list_etag = resp.headers['ETag']
+    assert list_etag == make_version_etag((1, 'test1'), (2, 'test2'))
+
+    resp = await db_cli_core.get(
+        '/users', params={'limit': 2},
+        headers={'If-None-Match': list_etag}
+    )
+    assert resp.status == 304
+
+    data = {'nickname': 'patched_nickname'}
+    await db_cli_core.patch('/users/1', data=json.dumps(data))
+    resp = await db_cli_core.get('/users/1', headers={'If-None-Match': etag})
+    assert resp.status == 200
+    resp = await db_cli_core.get(
+        '/users', params={'limit': 2},
+        headers={'If-None-Match': list_etag}
+    )
+    assert resp.status == 200
+
+    resp = await db_cli_core.get('/users/99')
+    assert resp.status == 404
+
+
+async def test_sparse_fieldsets(db_cli_core, get_all_users, get_user_1):
+    resp = await db_cli_core.get('/users', params={'fields': 'nickname'})
+    assert resp.status == 200
+    assert await resp.json() == [
+        {'nickname': u.nickname} for u in get_all_users
+    ]
+
+    resp = await db_cli_core.get(
+        '/users/1', params={'fields': 'nickname,id'}
+    )
+    assert resp.status == 200
+    assert await resp.json() == {
+        'id': 1, 'nickname': get_user_1.nickname
+    }
+
+    resp = await db_cli_core.get(
+        '/users', params={'fields': 'id'},
+        headers={'Accept': 'application/x-ndjson'}
+    )
+    lines = (await resp.text()).splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {'id': u.id} for u in get_all_users
+    ]
+
+
+@pytest.mark.parametrize('fields', ['', 'id,password'])
+async def test_sparse_fieldsets_bad_fields(db_cli_core, fields):
+    resp = await db_cli_core.get('/users', params={'fields': fields})
+    assert resp.status == 400
+    resp = await db_cli_core.get('/users/1', params={'fields': fields})
+    assert resp.status == 400
+
+
+async def test_sparse_fieldsets_data_key(db_router, db_app, aiohttp_client):
+
+    class NickSchema(UniqueUserSchema):
+        nickname = fields.Str(data_key='nick')
+
+    class NickViewSet(ModelViewSet):
+
+        route = db_router.extend('nicks')
+        model = User
+        serializer_class = NickSchema
+
+    cli = await aiohttp_client(db_app)
+    resp = await cli.get('/nicks/1', params={'fields': 'nick'})
+    assert resp.status == 200
+    assert await resp.json() == {'nick': 'test1'}
+
+    resp = await cli.get('/nicks', params={'fields': 'id,nick'})
+    assert (await resp.json())[0] == {'id': 1, 'nick': 'test1'}
+
+    resp = await cli.get('/nicks/1', params={'fields': 'nickname'})
+    assert resp.status == 400
+
+
+def test_sparse_fieldsets_projection():
+    from laviewset.gino_backend import _projection
+
+    query = _projection(User, ('id',))
+    assert [c.name for c in query.columns] == ['id']
+
+    query = _projection(User, ('nickname',))
+    assert [c.name for c in query.columns] == ['id', 'name']
+
+
+async def test_sparse_fieldsets_skip_cache(db_cli_core, model_viewset_core):
+    model_viewset_core.cache = cache = LRUCache()
+
+    resp = await db_cli_core.get('/users/1', params={'fields': 'id'})
+    assert await resp.json() == {'id': 1}
+    assert 1 not in cache
+
+    resp = await db_cli_core.get('/users/1')
+    assert (await resp.json())['nickname'] == 'test1'
+    assert 1 in cache
+
+
+@pytest.fixture
+def filtered_viewset(db_router):
+
+    class FilteredViewSet(ModelViewSet):
+
+        route = db_router.extend('filtered')
+        model = User
+        serializer_class = _serializer_class
+        filter_fields = {'id': ['exact', 'gt', 'in'], 'nickname': ['exact']}
+        ordering_fields = ('nickname',)
+
+    return FilteredViewSet
+
+
+async def test_list_filters(filtered_viewset, db_cli_core):
+    resp = await db_cli_core.get('/filtered', params={'id_gt': 1})
+    assert resp.status == 200
+    assert [u['id'] for u in await resp.json()] == [2, 3]
+
+    resp = await db_cli_core.get(
+        '/filtered', params={'id_in': '1,3', 'nickname': 'test3'}
+    )
+    assert [u['id'] for u in await resp.json()] == [3]
+
+    resp = await db_cli_core.get(
+        '/filtered', params={'id_gt': 1},
+        headers={'Accept': 'application/x-ndjson'}
+    )
+    lines = (await resp.text()).splitlines()
+    assert [json.loads(line)['id'] for line in lines] == [2, 3]
+
+
+async def test_list_ordering(filtered_viewset, db_cli_core):
+    resp = await db_cli_core.get(
+        '/filtered', params={'ordering': '-nickname', 'limit': 2}
+    )
+    assert resp.status == 200
+    assert [u['id'] for u in await resp.json()] == [3, 2]
+
+    # Ordered lists are paginated by offset.
+    next_url = resp.links['next']['url']
+    assert next_url.query['offset'] == '2'
+    resp = await db_cli_core.get(next_url.relative())
+    assert [u['id'] for u in await resp.json()] == [1]
+
+    resp = await db_cli_core.get(
+        '/filtered', params={'ordering': 'nickname', 'after': 'MQ'}
+    )
+    assert resp.status == 400
+
+
+@pytest.mark.parametrize('params', [
+    {'id_lt': 2}, {'id': 'a'}, {'ordering': 'id'}, {'id_gt': str(2 ** 63)}
+])
+async def test_list_filters_rejected(filtered_viewset, db_cli_core, params):
+    resp = await db_cli_core.get('/filtered', params=params)
+    assert resp.status == 400
+
+
+async def test_bulk_delete_filtered(filtered_viewset, db_cli_core):
+    filtered_viewset.cache = cache = LRUCache()
+    await db_cli_core.get('/filtered/2')
+    assert 2 in cache
+
+    resp = await db_cli_core.delete('/filtered', params={'id_gt': 1})
+    assert resp.status == 204
+    assert 2 not in cache
+    resp = await db_cli_core.get('/filtered')
+    assert [u['id'] for u in await resp.json()] == [1]
+
+    resp = await db_cli_core.delete('/filtered', params={'id_gt': 1})
+    assert resp.status == 204
+
+
+async def test_bulk_delete_filtered_max_size(filtered_viewset, db_cli_core):
+    filtered_viewset.max_bulk_size = 1
+
+    resp = await db_cli_core.delete('/filtered', params={'id_gt': 1})
+    assert resp.status == 400
+    resp = await db_cli_core.get('/filtered')
+    assert len(await resp.json()) == 3
+
+    resp = await db_cli_core.delete('/filtered', params={'nickname': 'test2'})
+    assert resp.status == 204
+    resp = await db_cli_core.get('/filtered')
+    assert [u['id'] for u in await resp.json()] == [1, 3]
+
+
+@pytest.mark.parametrize('params', [
+    {'ordering': 'nickname'},
+    {'limit': 1},
+    {'id': '1', 'nickname': 'test1'},
+    {'password': 'x'},
+])
+async def test_bulk_delete_filtered_rejected(
+        filtered_viewset, db_cli_core, params
+):
+    resp = await db_cli_core.delete('/filtered', params=params)
+    assert resp.status == 400
+    resp = await db_cli_core.get('/filtered')
+    assert len(await resp.json()) == 3
+
+
+def test_filter_fields_definition(db_router):
+    with pytest.raises(ViewSetDefinitionError):
+
+        class BadViewSet(ModelViewSet):
+
+            route = db_router.extend('bad')
+            model = User
+            serializer_class = _serializer_class
+            filter_fields = ('password',)
+
+
+@pytest.mark.parametrize('count_mode', ['exact', 'estimated'])
+async def test_list_total_count(db_cli_core, model_viewset_core, count_mode):
+    model_viewset_core.count_mode = count_mode
+
+    resp = await db_cli_core.get('/users', params={'limit': 1})
+    assert resp.status == 200
+    assert len(await resp.json()) == 1
+    total = int(resp.headers['X-Total-Count'])
+    if count_mode == 'exact':
+        assert total == 3
+
+    resp = await db_cli_core.head('/users')
+    assert resp.status == 200
+    assert int(resp.headers['X-Total-Count']) == total
+    assert await resp.read() == b''
+
+
+async def test_list_total_count_filtered(filtered_viewset, db_cli_core):
+    filtered_viewset.count_mode = 'exact'
+
+    resp = await db_cli_core.get('/filtered', params={'id_gt': 1})
+    assert resp.headers['X-Total-Count'] == '2'
+    resp = await db_cli_core.head('/filtered', params={'id_gt': 2})
+    assert resp.headers['X-Total-Count'] == '1'
+
+    filtered_viewset.count_mode = 'estimated'
+    resp = await db_cli_core.head('/filtered', params={'id_gt': 2})
+    assert int(resp.headers['X-Total-Count']) >= 0
+
+
+async def test_list_no_total_count(db_cli_core):
+    resp = await db_cli_core.get('/users')
+    assert 'X-Total-Count' not in resp.headers
+    resp = await db_cli_core.head('/users')
+    assert resp.status == 200
+    assert 'X-Total-Count' not in resp.headers
+
+
+def test_count_mode_definition(db_router):
+    with pytest.raises(ViewSetDefinitionError):
+
+        class BadViewSet(ModelViewSet):
+
+            route = db_router.extend('bad')
+            model = User
+            serializer_class = _serializer_class
+            count_mode = 'approximate'
+
+
+@pytest.fixture
+def single_flight_viewset(db_router):
+
+    class SingleFlightViewSet(ModelViewSet):
+
+        route = db_router.extend('coalesced')
+        model = User
+        serializer_class = _serializer_class
+        single_flight = True
+
+    return SingleFlightViewSet
+
+
+async def test_single_flight(single_flight_viewset, db_cli_core,
+                             get_user_1, monkeypatch):
+    calls = []
+    get_object = single_flight_viewset.get_object
+
+    async def slow_get_object(self, pk, **kwargs):
+        calls.append(pk)
+        await asyncio.sleep(0.05)
+        return await get_object(self, pk, **kwargs)
+
+    monkeypatch.setattr(single_flight_viewset, 'get_object', slow_get_object)
+
+    resps = await asyncio.gather(*(
+        db_cli_core.get('/coalesced/1') for _ in range(5)
+    ))
+    assert calls == [1]
+    for resp in resps:
+        assert resp.status == 200
+        assert await resp.json() == _serializer_class().dump(get_user_1)
+
+    # Each request gets its own 404.
+    resps = await asyncio.gather(*(
+        db_cli_core.get('/coalesced/99') for _ in range(3)
+    ))
+    assert calls == [1, 99]
+    assert [resp.status for resp in resps] == [404] * 3
+
+    resps = await asyncio.gather(
+        db_cli_core.get('/coalesced/1', params={'fields': 'id'}),
+        db_cli_core.get('/coalesced/1')
+    )
+    assert [await resp.json() for resp in resps] == [
+        {'id': 1}, _serializer_class().dump(get_user_1)
+    ]
+
+
+async def test_single_flight_list(single_flight_viewset, db_cli_core,
+                                  get_all_users):
+    resps = await asyncio.gather(
+        db_cli_core.get('/coalesced', params={'limit': 1}),
+        db_cli_core.get('/coalesced', params={'limit': 1}),
+        db_cli_core.get('/coalesced')
+    )
+    first, second, third = [await resp.json() for resp in resps]
+    assert first == second == _serializer_class(many=True).dump(
+        get_all_users[:1]
+    )
+    assert 'Link' in resps[0].headers and 'Link' in resps[1].headers
+    assert third == _serializer_class(many=True).dump(get_all_users)
+
+
+async def test_loader(db_cli_core, model_viewset_core, get_all_users,
+                      monkeypatch):
+    model_viewset_core.loader = loader = PrimaryKeyLoader(User)
+    batches = []
+    fetch = loader._fetch
+
+    async def spy_fetch(batch):
+        batches.append(sorted(batch))
+        await fetch(batch)
+
+    monkeypatch.setattr(loader, '_fetch', spy_fetch)
+
+    resps = await asyncio.gather(*(
+        db_cli_core.get(f'/users/{pk}') for pk in (1, 2, 2, 99)
+    ))
+    assert [resp.status for resp in resps] == [200, 200, 200, 404]
+    assert [(await resp.json())['id'] for resp in resps[:3]] == [1, 2, 2]
+    assert sum(batches, []) == [1, 2, 99]
+    assert len(batches) < 4
+
+    batches.clear()
+    users = await loader.load_many([3, 99, 1])
+    assert batches == [[1, 3, 99]]
+    assert users[1] is None
+    assert [u.id for u in (users[0], users[2])] == [3, 1]
+
+
+async def test_loader_batch_size(db_cli_core):
+    loader = PrimaryKeyLoader(User, window=0.01, max_batch_size=2)
+    users = await loader.load_many([1, 2, 3])
+    assert [u.id for u in users] == [1, 2, 3]
+
+
+@pytest.mark.parametrize('compile_serializers', [False, True])
+async def test_records(db_cli_core, model_viewset_core, get_all_users,
+                       compile_serializers):
+    model_viewset_core.use_records = True
+    model_viewset_core.compile_serializers = compile_serializers
+
+    resp = await db_cli_core.get('/users')
+    assert await resp.json() == \
+        _serializer_class(many=True).dump(get_all_users)
+
+    resp = await db_cli_core.get('/users', params={'limit': 2})
+    assert len(await resp.json()) == 2
+    assert 'next' in resp.links
+
+    resp = await db_cli_core.get('/users/1')
+    assert await resp.json() == {'id': 1, 'nickname': 'test1'}
+
+    resp = await db_cli_core.get('/users/1', params={'fields': 'nickname'})
+    assert await resp.json() == {'nickname': 'test1'}
+
+    resp = await db_cli_core.get('/users/99')
+    assert resp.status == 404
+
+    resp = await db_cli_core.get(
+        '/users', headers={'Accept': 'application/x-ndjson'}
+    )
+    lines = (await resp.text()).splitlines()
+    assert [json.loads(line) for line in lines] == \
+        _serializer_class(many=True).dump(get_all_users)
+
+
+async def test_records_backend(db_cli_core, model_viewset_core):
+    from laviewset.gino_backend import Row
+    from laviewset.pagination import PageParams
+
+    backend = model_viewset_core().get_backend()
+    page = PageParams(limit=None, after=None, offset=None)
+    rows = await backend.list(page, only=('nickname',), records=True)
+    assert all(isinstance(row, Row) for row in rows)
+    # Renamed columns are read under their attribute's name.
+    assert [(row.id, row.nickname) for row in rows] == \
+        [(1, 'test1'), (2, 'test2'), (3, 'test3')]
+    with pytest.raises(AttributeError):
+        rows[0].name
+
+    # Attributes that aren't columns need model instances.
+    objs = await backend.list(page, only=('query',), records=True)
+    assert all(isinstance(obj, User) for obj in objs)
+    assert not isinstance(await backend.get(1), Row)
+
+
+async def test_statement_cache(db_cli_core, model_viewset_core):
+    statements = model_viewset_core().get_backend().statements
+
+    for pk in (1, 2, 99):
+        await db_cli_core.get(f'/users/{pk}')
+    await db_cli_core.get('/users', params={'limit': 1})
+    resp = await db_cli_core.get('/users', params={'limit': 1, 'after': 'MQ'})
+    assert [u['id'] for u in await resp.json()] == [2]
+    info = statements.cache_info()
+    assert (info.hits, info.misses) == (2, 3)
+    assert info.compile_time > 0
+
+    model_viewset_core.use_returning = True
+    resp = await db_cli_core.patch('/users/2', json={'nickname': 'new'})
+    assert (await resp.json())['nickname'] == 'new'
+    resp = await db_cli_core.patch('/users/3', json={'nickname': 'newer'})
+    assert (await resp.json())['nickname'] == 'newer'
+    assert (await db_cli_core.delete('/users/3')).status == 204
+    assert (await db_cli_core.delete('/users/3')).status == 404
+    info = statements.cache_info()
+    assert (info.hits, info.misses) == (4, 5)
+
+
+async def test_statement_cache_filters(filtered_viewset, db_cli_core):
+    statements = filtered_viewset().get_backend().statements
+
+    for value in (1, 2):
+        resp = await db_cli_core.get('/filtered', params={'id_gt': value})
+        assert len(await resp.json()) == 3 - value
+    resp = await db_cli_core.get('/filtered', params={'nickname': 'test3'})
+    assert [u['id'] for u in await resp.json()] == [3]
+    assert (statements.hits, statements.misses) == (1, 2)
+
+
+async def test_get_object_untyped_pk(db_router, db_app, aiohttp_client):
+    from laviewset import HttpMethods
+
+    summary_route = db_router.extend('summaries')
+
+    class SummaryViewSet(ModelViewSet):
+
+        route = summary_route
+        model = User
+        serializer_class = _serializer_class
+
+        @summary_route('/{pk}/summary', HttpMethods.GET)
+        async def summary(self, request, *, pk):
+            user = await self.get_object(pk)
+            return self.json_response({'nickname': user.nickname})
+
+    cli = await aiohttp_client(db_app)
+    resp = await cli.get('/summaries/1/summary')
+    assert resp.status == 200
+    assert await resp.json() == {'nickname': 'test1'}
+
+    for pk in ('99', 'abc'):
+        resp = await cli.get(f'/summaries/{pk}/summary')
+        assert resp.status == 404
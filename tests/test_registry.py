@@ -0,0 +1,118 @@
+import pytest
+from aiohttp import web
+
+from laviewset import install, registry, routes, views, HttpMethods
+
+
+@pytest.fixture(autouse=True)
+def _registry(monkeypatch):
+    monkeypatch.setattr(registry, '_registry', {})
+
+
+@pytest.fixture
+def base_route():
+    return routes.Route.create_base()
+
+
+@pytest.fixture
+def viewset(base_route):
+
+    class TestViewSet(views.ViewSet):
+
+        route = base_route.extend('tests')
+
+        @route('/{slug}', HttpMethods.GET)
+        async def by_slug(self, request, *, slug):
+            return web.Response(text=f'slug {slug}')
+
+        @route('/', HttpMethods.GET)
+        async def list(self, request):
+            return web.Response(text='list')
+
+        @route('/latest', HttpMethods.GET)
+        async def latest(self, request):
+            return web.Response(text='latest')
+
+    return TestViewSet
+
+
+def test_deferred_viewset_is_registered(viewset):
+    assert registry.registered() == [viewset]
+
+
+def test_install_sorts_static_routes_first(viewset):
+    app = web.Application()
+    install(app)
+    paths = [resource.canonical for resource in app.router.resources()]
+    assert paths == ['/tests', '/tests/latest', '/tests/{slug}']
+
+
+def test_install_freezes_router(viewset):
+    app = web.Application()
+    install(app)
+    assert app.router.frozen
+
+    app = web.Application()
+    install(app, freeze=False)
+    assert not app.router.frozen
+
+
+async def test_install_on_several_apps(aiohttp_client, viewset):
+    clients = []
+    for _ in range(2):
+        app = web.Application()
+        install(app)
+        clients.append(await aiohttp_client(app))
+
+    for cli in clients:
+        resp = await cli.get('/tests/latest')
+        assert await resp.text() == 'latest'
+        resp = await cli.get('/tests/abc')
+        assert await resp.text() == 'slug abc'
+
+
+def test_install_selected_viewsets(base_route, viewset):
+
+    class OtherViewSet(views.ViewSet):
+
+        route = base_route.extend('others')
+
+        @route('/', HttpMethods.GET)
+        async def list(self, request):
+            return web.Response(text='others')
+
+    app = web.Application()
+    install(app, [OtherViewSet])
+    paths = [resource.canonical for resource in app.router.resources()]
+    assert paths == ['/others']
+
+
+def test_install_conflicting_routes(base_route, viewset):
+
+    class ConflictingViewSet(views.ViewSet):
+
+        route = base_route.extend('tests')
+
+        @route('/latest', HttpMethods.GET)
+        async def latest(self, request):
+            return web.Response(text='latest')
+
+    app = web.Application()
+    with pytest.raises(registry.RouteConflictError):
+        install(app)
+    assert not list(app.router.resources())
+
+
+def test_install_non_deferred_viewset():
+    app = web.Application()
+
+    class BoundViewSet(views.ViewSet):
+
+        route = routes.Route.create_base(app.router).extend('bound')
+
+        @route('/', HttpMethods.GET)
+        async def list(self, request):
+            return web.Response(text='bound')
+
+    with pytest.raises(ValueError):
+        install(web.Application(), [BoundViewSet])
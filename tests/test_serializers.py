@@ -0,0 +1,115 @@
+import decimal
+from types import SimpleNamespace
+
+from marshmallow import Schema, fields, post_dump
+
+from laviewset.serializers import compile_dump
+
+
+class ChildSchema(Schema):
+
+    name = fields.Str()
+
+
+class ObjSchema(Schema):
+
+    id = fields.Int()
+    name = fields.Str(data_key='title')
+    nickname = fields.Str(attribute='alias')
+    price = fields.Float()
+    active = fields.Bool()
+    raw = fields.Raw()
+    count = fields.Int(as_string=True)
+    method = fields.Method('get_method')
+    child = fields.Nested(ChildSchema)
+    secret = fields.Str(load_only=True)
+
+    def get_method(self, obj):
+        return obj.id * 2
+
+
+class PostDumpSchema(Schema):
+
+    id = fields.Int()
+
+    @post_dump
+    def add_extra(self, data, **kwargs):
+        data['extra'] = True
+        return data
+
+
+def _obj(i, **kw):
+    values = dict(
+        id=i, name=f'obj {i}', alias=f'alias {i}', price=i * 1.5,
+        active=bool(i % 2), raw={'i': i}, count=i,
+        child=SimpleNamespace(name='child'), secret='secret'
+    )
+    values.update(kw)
+    return SimpleNamespace(**values)
+
+
+def test_compile_dump_matches_dump():
+    schema = ObjSchema()
+    dump = compile_dump(schema)
+
+    assert dump is not schema.dump
+    for obj in (_obj(1), _obj(2, name=None, price=None)):
+        assert dump(obj) == schema.dump(obj)
+        assert list(dump(obj)) == list(schema.dump(obj))
+
+
+def test_compile_dump_converts_values():
+    schema = ObjSchema()
+    dump = compile_dump(schema)
+    obj = _obj(1, id=True, name=10, price=decimal.Decimal('1.5'), active=1)
+
+    assert dump(obj) == schema.dump(obj)
+    assert dump(obj)['id'] == 1 and type(dump(obj)['id']) is int
+    assert dump(obj)['title'] == '10'
+
+
+def test_compile_dump_many():
+    schema = ObjSchema(many=True)
+    dump = compile_dump(schema)
+    objs = [_obj(i) for i in range(10)]
+
+    assert dump(objs) == schema.dump(objs)
+    assert dump([]) == []
+
+
+def test_compile_dump_only():
+    schema = ObjSchema(only=('id', 'method'))
+    obj = _obj(1)
+
+    assert compile_dump(schema)(obj) == {'id': 1, 'method': 2}
+
+
+def test_compile_dump_processors_fallback():
+    schema = PostDumpSchema()
+    assert compile_dump(schema) == schema.dump
+
+
+def test_compile_dump_missing_attributes():
+    schema = ObjSchema(exclude=('method',))
+    dump = compile_dump(schema)
+    obj = _obj(1)
+    del obj.raw, obj.id, obj.name
+
+    assert dump(obj) == schema.dump(obj)
+    assert 'raw' not in dump(obj) and 'id' not in dump(obj)
+
+    class DefaultSchema(Schema):
+
+        id = fields.Int(default=0)
+
+    schema = DefaultSchema()
+    assert compile_dump(schema)(SimpleNamespace()) == {'id': 0}
+
+
+def test_compile_dump_mappings():
+    schema = ObjSchema(many=True, exclude=('method',))
+    dump = compile_dump(schema)
+    objs = [vars(_obj(1)), {'id': 2}]
+
+    assert dump(objs) == schema.dump(objs)
+    assert dump(objs)[1] == {'id': 2}
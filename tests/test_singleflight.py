@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from laviewset.singleflight import SingleFlight
+
+
+class Call:
+
+    def __init__(self, result=None, exc=None):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.result = result
+        self.exc = exc
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.exc is not None:
+            raise self.exc
+        return self.result
+
+
+async def test_concurrent_calls_are_shared():
+    flight = SingleFlight()
+    call = Call('result')
+
+    tasks = [asyncio.ensure_future(flight.do('key', call)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert len(flight) == 1
+
+    call.release.set()
+    assert await asyncio.gather(*tasks) == ['result'] * 5
+    assert call.calls == 1
+    assert len(flight) == 0
+
+
+async def test_different_keys_are_not_shared():
+    flight = SingleFlight()
+    call = Call('result')
+    call.release.set()
+
+    await asyncio.gather(flight.do(1, call), flight.do(2, call))
+    assert call.calls == 2
+
+
+async def test_sequential_calls_are_not_shared():
+    flight = SingleFlight()
+    call = Call('result')
+    call.release.set()
+
+    await flight.do('key', call)
+    await flight.do('key', call)
+    assert call.calls == 2
+
+
+async def test_cancelled_caller_does_not_cancel_call():
+    flight = SingleFlight()
+    call = Call('result')
+
+    first = asyncio.ensure_future(flight.do('key', call))
+    second = asyncio.ensure_future(flight.do('key', call))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+
+    call.release.set()
+    assert await second == 'result'
+    assert first.cancelled()
+    assert call.calls == 1
+
+
+async def test_exception_is_shared():
+    flight = SingleFlight()
+    call = Call(exc=ValueError('boom'))
+
+    tasks = [asyncio.ensure_future(flight.do('key', call)) for _ in range(2)]
+    await asyncio.sleep(0)
+    call.release.set()
+    for task in tasks:
+        with pytest.raises(ValueError):
+            await task
+    assert call.calls == 1
+    assert len(flight) == 0
@@ -0,0 +1,90 @@
+from laviewset.statements import StatementCache
+
+
+class FakeTimer:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeQuery:
+
+    def __init__(self, sql, timer=None):
+        self.sql = sql
+        self.timer = timer
+
+    def compile(self, dialect):
+        if self.timer is not None:
+            self.timer.now += 0.5
+        return (dialect, self.sql)
+
+
+def test_get():
+    timer = FakeTimer()
+    cache = StatementCache(timer=timer)
+    dialect = object()
+
+    built = []
+
+    def build():
+        built.append(1)
+        return FakeQuery('SELECT 1', timer)
+
+    assert cache.get('one', dialect, build) == (dialect, 'SELECT 1')
+    assert cache.get('one', dialect, build) == (dialect, 'SELECT 1')
+    assert len(built) == 1
+    assert 'one' in cache and len(cache) == 1
+
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+    assert info.compile_time == 0.5
+    assert info.hit_rate == 0.5
+
+
+def test_uncached_key():
+    cache = StatementCache()
+    dialect = object()
+
+    cache.get(None, dialect, lambda: FakeQuery('SELECT 1'))
+    cache.get(None, dialect, lambda: FakeQuery('SELECT 1'))
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_maxsize():
+    cache = StatementCache(2)
+    dialect = object()
+
+    cache.get('one', dialect, lambda: FakeQuery('SELECT 1'))
+    cache.get('two', dialect, lambda: FakeQuery('SELECT 2'))
+    cache.get('one', dialect, lambda: FakeQuery('SELECT 1'))
+    # The least recently used statement is evicted.
+    cache.get('three', dialect, lambda: FakeQuery('SELECT 3'))
+    assert 'one' in cache and 'three' in cache and 'two' not in cache
+    assert cache.get('two', dialect, lambda: FakeQuery('SELECT 2')) == \
+        (dialect, 'SELECT 2')
+    assert 'one' not in cache and len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_maxsize_zero():
+    cache = StatementCache(0)
+    cache.get('one', object(), lambda: FakeQuery('SELECT 1'))
+    assert len(cache) == 0
+
+
+def test_dialect_change():
+    cache = StatementCache()
+    old, new = object(), object()
+
+    cache.get('one', old, lambda: FakeQuery('SELECT 1'))
+    assert cache.get('one', new, lambda: FakeQuery('SELECT 1')) == \
+        (new, 'SELECT 1')
+    assert cache.misses == 2 and len(cache) == 1
+
+
+def test_hit_rate_empty():
+    assert StatementCache().cache_info().hit_rate == 0.0
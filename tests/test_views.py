@@ -303,3 +303,55 @@ def test_registered_routedef(mock_webroute, base_route):
     assert call_args[0] == 'GET'
     assert call_args[1] == '/test'
     assert call_kwargs['z'] == 10
+
+
+@pytest.fixture
+def cli_typed(loop, aiohttp_client, app, base_route):
+
+    class TypedViewSet(views.ViewSet):
+
+        route = base_route.extend('typed')
+
+        @route('/{pk:int}', HttpMethods.GET)
+        async def retrieve(self, request, *, pk):
+            return web.json_response([type(pk).__name__, pk])
+
+        @route('/{key:uuid}/{slug:slug}', HttpMethods.GET)
+        async def by_key(self, request, *, key, slug):
+            return web.json_response([type(key).__name__, str(key), slug])
+
+    return loop.run_until_complete(aiohttp_client(app))
+
+
+async def test_typed_path_variables(cli_typed):
+    resp = await cli_typed.get('/typed/42')
+    assert await resp.json() == ['int', 42]
+
+    key = '6f1c1f5e-3b7a-4c2e-9a1b-2f4e5d6c7b8a'
+    resp = await cli_typed.get(f'/typed/{key}/some-slug')
+    assert await resp.json() == ['UUID', key, 'some-slug']
+
+    bad_paths = ('/typed/abc', f'/typed/{key[:-1]}/a', f'/typed/{key}/a.b')
+    for path in bad_paths:
+        resp = await cli_typed.get(path)
+        assert resp.status == 404
+
+
+def test_view_without_path_variables_is_handler(base_route):
+
+    class ViewSets(views.ViewSet):
+
+        route = base_route.extend('plain')
+
+        @route('/', HttpMethods.GET)
+        async def list(self, request):
+            ...
+
+        @route('/{pk:int}', HttpMethods.GET)
+        async def retrieve(self, request, *, pk):
+            ...
+
+    viewset = ViewSets()
+    assert views._get_handler_from_view(viewset.list) == viewset.list
+    assert views._get_handler_from_view(viewset.retrieve) != \
+        viewset.retrieve